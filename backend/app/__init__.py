@@ -1 +1,7 @@
 # Fund Analysis Backend Application
+import pandas as pd
+
+# Copy-on-Write lets the store hand out its frames without defensive
+# copies: a caller that modifies one only copies the data it touches.
+# Set here so every module sees it, whatever the import order
+pd.set_option('mode.copy_on_write', True)
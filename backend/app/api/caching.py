@@ -0,0 +1,56 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.storage import DataStore
+
+# Clients may reuse a response but must revalidate it, so a new upload
+# is picked up on the next request
+CACHE_CONTROL = "private, no-cache"
+
+
+class DataVersionETagMiddleware:
+    """
+    Conditional GET support for the API
+
+    Every GET under /api is a pure function of the URL and the uploaded data,
+    so the ETag only needs to identify the data set. Requests whose
+    If-None-Match matches get a 304 without running the handler.
+    """
+
+    def __init__(self, app: ASGIApp, path_prefix: str = "/api/"):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Taken before the handler runs, so the data it sees is never older
+        etag = f'W/"{DataStore().data_token}"'
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [
+                    (b"etag", etag.encode("latin-1")),
+                    (b"cache-control", CACHE_CONTROL.encode("latin-1"))
+                ]
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"etag", etag.encode("latin-1")),
+                    (b"cache-control", CACHE_CONTROL.encode("latin-1"))
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -1,22 +1,77 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Any, Optional, List, Union
 import pandas as pd
 from app.storage import DataStore
-from app.api.dependencies import require_data
+from app.api.dependencies import get_store
+from app.api.responses import FastORJSONResponse, ResponseFormat
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastORJSONResponse)
 
 
-@router.get("/funds", dependencies=[Depends(require_data)])
-async def get_funds(
+def _is_nan(value: Any) -> bool:
+    """Cheap scalar missing-value check (NaN floats fail value == value)"""
+    return value is None or value is pd.NaT or (isinstance(value, float) and value != value)
+
+
+# Fields returned by the fund list and comparison endpoints
+FUND_LIST_FIELDS = (
+    'fund_id', 'fund_name', 'ISIN', 'Firm Name',
+    'Morningstar Category', 'ASISA Sector (South Africa)',
+    'Morningstar Rating Overall', 'Management Fee'
+)
+
+COMPARISON_FIELDS = (
+    'fund_id', 'fund_name', 'ISIN', 'Firm Name',
+    'Morningstar Category', 'ASISA Sector (South Africa)',
+    'Management Fee', 'Performance Fee',
+    'Morningstar Rating Overall', 'Investment Area'
+)
+
+
+def _serialize_funds(
+    funds_df: pd.DataFrame,
+    fields: List[str],
+    response_format: ResponseFormat = ResponseFormat.records
+) -> Union[List[dict], dict]:
+    """
+    Convert the selected fund columns to JSON-ready lists, NaN as None
+
+    Args:
+        funds_df: Funds DataFrame containing every field
+        fields: Columns to emit
+        response_format: 'records' for a list of fund objects,
+            'columnar' for a dict of parallel arrays
+
+    Returns:
+        List of records or dict of column arrays
+    """
+    columns = [
+        funds_df[field].astype(object).where(funds_df[field].notna(), None).tolist()
+        for field in fields
+    ]
+
+    if response_format == ResponseFormat.columnar:
+        return dict(zip(fields, columns))
+
+    return [dict(zip(fields, row)) for row in zip(*columns)]
+
+
+@router.get("/funds")
+def get_funds(
     category: Optional[str] = None,
     sector: Optional[str] = None,
     search: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    response_format: ResponseFormat = Query(ResponseFormat.records, alias="format"),
+    data_store: DataStore = Depends(get_store)
 ):
-    """Get list of funds with optional filtering"""
-    data_store = DataStore()
+    """
+    Get list of funds with optional filtering
+
+    With format=columnar the funds are returned as parallel arrays
+    keyed by field name
+    """
     funds_df = data_store.get_funds()
 
     # Apply filters
@@ -29,41 +84,29 @@ async def get_funds(
             funds_df = funds_df[funds_df['ASISA Sector (South Africa)'] == sector]
 
     if search:
-        funds_df = funds_df[
-            funds_df['fund_name'].str.contains(search, case=False, na=False)
-        ]
+        matches = data_store.match_fund_names(search)
+        funds_df = funds_df[matches.loc[funds_df.index]]
 
     # Paginate
     total = len(funds_df)
     funds_df = funds_df.iloc[skip:skip+limit]
 
-    # Select key fields
-    key_fields = [
-        'fund_id', 'fund_name', 'ISIN', 'Firm Name',
-        'Morningstar Category', 'ASISA Sector (South Africa)',
-        'Morningstar Rating Overall', 'Management Fee'
-    ]
-
     # Only include fields that exist
-    available_fields = [f for f in key_fields if f in funds_df.columns]
-    funds_list = funds_df[available_fields].to_dict('records')
-
-    # Replace NaN with None for JSON serialization
-    for fund in funds_list:
-        for key, value in fund.items():
-            if pd.isna(value):
-                fund[key] = None
+    available_fields = [f for f in FUND_LIST_FIELDS if f in funds_df.columns]
+    funds_list = _serialize_funds(funds_df, available_fields, response_format)
 
-    return {
+    return FastORJSONResponse({
         "total": total,
         "funds": funds_list
-    }
+    })
 
 
-@router.get("/funds/{fund_id}", dependencies=[Depends(require_data)])
-async def get_fund_detail(fund_id: int):
+@router.get("/funds/{fund_id}")
+def get_fund_detail(
+    fund_id: int,
+    data_store: DataStore = Depends(get_store)
+):
     """Get detailed information for a single fund"""
-    data_store = DataStore()
     fund = data_store.get_fund_by_id(fund_id)
 
     if fund is None:
@@ -73,20 +116,18 @@ async def get_fund_detail(fund_id: int):
     returns = data_store.get_returns_by_fund_id(fund_id)
     inception_date = returns['date'].min() if returns is not None and len(returns) > 0 else None
 
-    # Convert to dict
-    fund_dict = fund.to_dict()
+    # Convert to dict, replacing NaN with None
+    fund_dict = {key: None if _is_nan(value) else value for key, value in fund.items()}
     fund_dict['inception_date'] = inception_date.strftime('%Y-%m-%d') if inception_date else None
 
-    # Replace NaN with None
-    for key, value in fund_dict.items():
-        if pd.isna(value):
-            fund_dict[key] = None
+    return FastORJSONResponse(fund_dict)
 
-    return fund_dict
 
-
-@router.post("/funds/compare", dependencies=[Depends(require_data)])
-async def compare_funds(fund_ids: List[int]):
+@router.post("/funds/compare")
+def compare_funds(
+    fund_ids: List[int],
+    data_store: DataStore = Depends(get_store)
+):
     """
     Compare static information for multiple funds
 
@@ -96,34 +137,17 @@ async def compare_funds(fund_ids: List[int]):
     Returns:
         Side-by-side comparison of fund attributes
     """
-    data_store = DataStore()
-    funds_df = data_store.get_funds()
-
-    # Filter to selected funds
-    selected_funds = funds_df[funds_df['fund_id'].isin(fund_ids)]
+    # Look up selected funds
+    selected_funds = data_store.get_funds_by_ids(fund_ids)
 
     if len(selected_funds) == 0:
         raise HTTPException(status_code=404, detail="No funds found with provided IDs")
 
-    # Select comparison fields
-    comparison_fields = [
-        'fund_id', 'fund_name', 'ISIN', 'Firm Name',
-        'Morningstar Category', 'ASISA Sector (South Africa)',
-        'Management Fee', 'Performance Fee',
-        'Morningstar Rating Overall', 'Investment Area'
-    ]
-
     # Only include fields that exist
-    available_fields = [f for f in comparison_fields if f in selected_funds.columns]
-    funds_list = selected_funds[available_fields].to_dict('records')
-
-    # Replace NaN with None
-    for fund in funds_list:
-        for key, value in fund.items():
-            if pd.isna(value):
-                fund[key] = None
+    available_fields = [f for f in COMPARISON_FIELDS if f in selected_funds.columns]
+    funds_list = _serialize_funds(selected_funds, available_fields)
 
-    return {
+    return FastORJSONResponse({
         "funds": funds_list,
         "comparison_fields": available_fields
-    }
+    })
@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict
+from app.storage import DataStore
+from app.utils.calculations import PerformanceCalculator
+from app.utils.risk_calculations import RiskCalculator
+
+
+# Results are pure functions of the stored data, so they are cached per
+# data_version; a new upload bumps the version and clear_caches() drops
+# the old entries. Cached dicts are shared between requests and must not
+# be mutated.
+
+
+def clear_caches():
+    """Drop cached results after the stored data changes"""
+    get_period_performance.cache_clear()
+    get_risk_metrics.cache_clear()
+
+
+# Sized to hold the full-history entry of every fund filled in by
+# precompute_fund_metrics, plus date-filtered requests
+@lru_cache(maxsize=16384)
+def get_period_performance(
+    fund_id: int,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    data_version: int
+) -> Optional[Dict]:
+    """
+    Period returns (including YTD) for a fund, cached per data version
+
+    Returns:
+        Dict with performance, inception_date and as_of_date, or None
+        if the fund has no returns in the date range
+    """
+    data_store = DataStore()
+    returns_df = data_store.get_returns_by_fund_id(fund_id, start_date, end_date)
+    if returns_df is None or len(returns_df) == 0:
+        return None
+
+    log_growth = data_store.get_log_growth_by_fund_id(fund_id, start_date, end_date)
+    period_returns = PerformanceCalculator.calculate_period_returns(returns_df, log_growth)
+    ytd_return = PerformanceCalculator.calculate_ytd_return(returns_df, log_growth)
+    if ytd_return is not None:
+        period_returns['YTD'] = ytd_return
+
+    return {
+        'performance': period_returns,
+        'inception_date': returns_df['date'].min().strftime('%Y-%m-%d'),
+        'as_of_date': returns_df['date'].max().strftime('%Y-%m-%d')
+    }
+
+
+@lru_cache(maxsize=16384)
+def get_risk_metrics(
+    fund_id: int,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    risk_free_rate: float,
+    data_version: int
+) -> Optional[Dict]:
+    """
+    Risk metrics for a fund, cached per data version
+
+    Returns:
+        Dict with risk_metrics, start_date and end_date, or None if the
+        fund has no returns in the date range
+    """
+    returns_df = DataStore().get_returns_by_fund_id(fund_id, start_date, end_date)
+    if returns_df is None or len(returns_df) == 0:
+        return None
+
+    return {
+        'risk_metrics': RiskCalculator.calculate_risk_metrics(returns_df, risk_free_rate),
+        'start_date': returns_df['date'].min().strftime('%Y-%m-%d'),
+        'end_date': returns_df['date'].max().strftime('%Y-%m-%d')
+    }
+
+
+def _precompute_fund(fund_id: int, data_version: int):
+    """Fill both caches with one fund's full-history results"""
+    if DataStore().data_version != data_version:
+        # Newer data was uploaded while this was queued
+        return
+    get_period_performance(fund_id, None, None, data_version)
+    get_risk_metrics(fund_id, None, None, 0.0, data_version)
+
+
+def precompute_fund_metrics(data_version: int):
+    """
+    Fill the metric caches with every fund's full-history results
+
+    Run after an upload so the common unfiltered performance and risk
+    requests are cache hits. Funds are independent, so they are spread
+    over a thread pool; the numeric kernels release the GIL.
+    """
+    fund_ids = DataStore().get_fund_ids()
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        list(pool.map(_precompute_fund, fund_ids, [data_version] * len(fund_ids)))
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, List
-from pydantic import BaseModel
+import asyncio
+from pydantic import BaseModel, Field
 import pandas as pd
 import numpy as np
 from app.storage import DataStore
-from app.api.dependencies import require_data
-from app.utils.calculations import PerformanceCalculator
+from app.api import metrics
+from app.api.dependencies import get_store
+from app.api.responses import FastORJSONResponse, ResponseFormat, format_series
+from app.utils.calculations import PerformanceCalculator, months_before
 from app.utils.risk_calculations import RiskCalculator
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastORJSONResponse)
 
 
 class CompareRequest(BaseModel):
@@ -28,14 +32,15 @@ class CorrelationRequest(BaseModel):
     fund_ids: List[int]
     start_date: Optional[str] = None
     end_date: Optional[str] = None
-    months: Optional[int] = 36  # Default to 36 months (3 years)
+    months: Optional[int] = Field(36, ge=0, le=1200)  # Default to 36 months (3 years)
 
 
-@router.get("/performance/{fund_id}", dependencies=[Depends(require_data)])
-async def get_performance(
+@router.get("/performance/{fund_id}")
+def get_performance(
     fund_id: int,
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    data_store: DataStore = Depends(get_store)
 ):
     """
     Get performance metrics for standard periods
@@ -43,49 +48,38 @@ async def get_performance(
     Returns:
         Performance metrics for 1M, 3M, 6M, 1Y, 3Y, 5Y, 10Y, ITD, YTD
     """
-    data_store = DataStore()
-
     # Get fund info
     fund = data_store.get_fund_by_id(fund_id)
     if fund is None:
         raise HTTPException(status_code=404, detail="Fund not found")
 
-    # Get returns
-    returns_df = data_store.get_returns_by_fund_id(fund_id, start_date, end_date)
-    if returns_df is None or len(returns_df) == 0:
+    # Calculate period returns (including YTD)
+    performance = metrics.get_period_performance(
+        fund_id, start_date, end_date, data_store.data_version
+    )
+    if performance is None:
         raise HTTPException(status_code=404, detail="No returns data found for this fund")
 
-    # Calculate period returns
-    period_returns = PerformanceCalculator.calculate_period_returns(returns_df)
-
-    # Calculate YTD
-    ytd_return = PerformanceCalculator.calculate_ytd_return(returns_df)
-    if ytd_return is not None:
-        period_returns['YTD'] = ytd_return
-
-    # Get inception date
-    inception_date = returns_df['date'].min().strftime('%Y-%m-%d')
-    as_of_date = returns_df['date'].max().strftime('%Y-%m-%d')
-
-    return {
+    return FastORJSONResponse({
         "fund_id": fund_id,
         "fund_name": fund['fund_name'],
-        "as_of_date": as_of_date,
-        "inception_date": inception_date,
-        "performance": period_returns
-    }
+        "as_of_date": performance['as_of_date'],
+        "inception_date": performance['inception_date'],
+        "performance": performance['performance']
+    })
 
 
-@router.get("/performance/{fund_id}/calendar-years", dependencies=[Depends(require_data)])
-async def get_calendar_year_returns(fund_id: int):
+@router.get("/performance/{fund_id}/calendar-years")
+def get_calendar_year_returns(
+    fund_id: int,
+    data_store: DataStore = Depends(get_store)
+):
     """
     Get calendar year returns
 
     Returns:
         Annual returns by calendar year
     """
-    data_store = DataStore()
-
     # Get fund info
     fund = data_store.get_fund_by_id(fund_id)
     if fund is None:
@@ -99,96 +93,107 @@ async def get_calendar_year_returns(fund_id: int):
     # Calculate calendar year returns
     calendar_returns = PerformanceCalculator.calculate_calendar_year_returns(returns_df)
 
-    return {
+    return FastORJSONResponse({
         "fund_id": fund_id,
         "fund_name": fund['fund_name'],
         "calendar_year_returns": calendar_returns
+    })
+
+
+def _fund_performance(
+    data_store: DataStore,
+    fund_id: int,
+    fund_name: str,
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> Optional[dict]:
+    """Calculate period returns for one fund of a comparison"""
+    performance = metrics.get_period_performance(
+        fund_id, start_date, end_date, data_store.data_version
+    )
+    if performance is None:
+        return None
+
+    return {
+        'fund_id': fund_id,
+        'fund_name': fund_name,
+        'performance': performance['performance'],
+        'inception_date': performance['inception_date']
     }
 
 
-@router.post("/performance/compare", dependencies=[Depends(require_data)])
-async def compare_performance(request: CompareRequest):
+@router.post("/performance/compare")
+async def compare_performance(
+    request: CompareRequest,
+    data_store: DataStore = Depends(get_store)
+):
     """
     Compare performance of multiple funds
 
     Returns:
         Performance data for all selected funds
     """
-    data_store = DataStore()
-
-    funds_performance = []
-
-    for fund_id in request.fund_ids:
-        fund = data_store.get_fund_by_id(fund_id)
-        if fund is None:
-            continue
-
-        returns_df = data_store.get_returns_by_fund_id(fund_id, request.start_date, request.end_date)
-        if returns_df is None or len(returns_df) == 0:
-            continue
-
-        # Calculate metrics
-        period_returns = PerformanceCalculator.calculate_period_returns(returns_df)
-        ytd_return = PerformanceCalculator.calculate_ytd_return(returns_df)
-        if ytd_return is not None:
-            period_returns['YTD'] = ytd_return
-
-        funds_performance.append({
-            'fund_id': fund_id,
-            'fund_name': fund['fund_name'],
-            'performance': period_returns,
-            'inception_date': returns_df['date'].min().strftime('%Y-%m-%d')
-        })
-
-    return {
+    names_by_id = data_store.get_fund_names(request.fund_ids)
+
+    # Calculate each fund in the threadpool so funds are processed concurrently
+    # (as every multi-fund handler does)
+    results = await asyncio.gather(*[
+        run_in_threadpool(
+            _fund_performance, data_store, fund_id, names_by_id[fund_id],
+            request.start_date, request.end_date
+        )
+        for fund_id in request.fund_ids
+        if fund_id in names_by_id
+    ])
+    funds_performance = [result for result in results if result is not None]
+
+    return FastORJSONResponse({
         "funds": funds_performance,
         "as_of_date": request.end_date if request.end_date else None
-    }
+    })
 
 
-@router.get("/risk/{fund_id}", dependencies=[Depends(require_data)])
-async def get_risk_metrics(
+@router.get("/risk/{fund_id}")
+def get_risk_metrics(
     fund_id: int,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    risk_free_rate: float = 0.0
+    risk_free_rate: float = 0.0,
+    data_store: DataStore = Depends(get_store)
 ):
     """Get comprehensive risk metrics for a fund"""
-    data_store = DataStore()
-
     # Get fund info
     fund = data_store.get_fund_by_id(fund_id)
     if fund is None:
         raise HTTPException(status_code=404, detail="Fund not found")
 
-    # Get returns
-    returns_df = data_store.get_returns_by_fund_id(fund_id, start_date, end_date)
-    if returns_df is None or len(returns_df) == 0:
-        raise HTTPException(status_code=404, detail="No returns data found for this fund")
-
     # Calculate risk metrics
-    risk_metrics = RiskCalculator.calculate_risk_metrics(returns_df, risk_free_rate)
+    risk = metrics.get_risk_metrics(
+        fund_id, start_date, end_date, risk_free_rate, data_store.data_version
+    )
+    if risk is None:
+        raise HTTPException(status_code=404, detail="No returns data found for this fund")
 
-    return {
+    return FastORJSONResponse({
         "fund_id": fund_id,
         "fund_name": fund['fund_name'],
         "period": {
-            "start_date": returns_df['date'].min().strftime('%Y-%m-%d'),
-            "end_date": returns_df['date'].max().strftime('%Y-%m-%d')
+            "start_date": risk['start_date'],
+            "end_date": risk['end_date']
         },
-        "risk_metrics": risk_metrics
-    }
+        "risk_metrics": risk['risk_metrics']
+    })
 
 
-@router.get("/risk/{fund_id}/drawdown", dependencies=[Depends(require_data)])
-async def get_drawdown_series(
+@router.get("/risk/{fund_id}/drawdown")
+def get_drawdown_series(
     fund_id: int,
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    response_format: ResponseFormat = Query(ResponseFormat.records, alias="format"),
+    data_store: DataStore = Depends(get_store)
 ):
     """Get drawdown time series for charting"""
-    data_store = DataStore()
-
     # Get fund info
     fund = data_store.get_fund_by_id(fund_id)
     if fund is None:
@@ -202,114 +207,133 @@ async def get_drawdown_series(
     # Calculate drawdown series
     drawdown_df = RiskCalculator.calculate_drawdown_series(returns_df)
 
-    drawdown_list = []
-    for _, row in drawdown_df.iterrows():
-        drawdown_list.append({
-            'date': row['date'].strftime('%Y-%m-%d'),
-            'drawdown': float(row['drawdown'])
-        })
-
-    return {
+    return FastORJSONResponse({
         "fund_id": fund_id,
         "fund_name": fund['fund_name'],
-        "drawdown_series": drawdown_list
-    }
+        "drawdown_series": format_series(drawdown_df, ['drawdown'], response_format)
+    })
 
 
-@router.post("/performance/rolling-returns", dependencies=[Depends(require_data)])
-async def get_rolling_returns(request: RollingReturnsRequest):
-    """Get rolling returns for multiple funds"""
-    data_store = DataStore()
-
-    funds_rolling = []
-
-    for fund_id in request.fund_ids:
-        fund = data_store.get_fund_by_id(fund_id)
-        if fund is None:
-            continue
-
-        returns_df = data_store.get_returns_by_fund_id(fund_id, request.start_date, request.end_date)
-        if returns_df is None or len(returns_df) == 0:
-            continue
-
-        # Calculate rolling returns
-        rolling_df = PerformanceCalculator.calculate_rolling_returns(returns_df, request.window_months)
-
-        rolling_list = []
-        for _, row in rolling_df.iterrows():
-            value = row['rolling_return']
-            # Replace NaN/Inf with None for JSON serialization
-            if pd.isna(value) or np.isinf(value):
-                rolling_value = None
-            else:
-                rolling_value = float(value)
-
-            rolling_list.append({
-                'date': row['date'].strftime('%Y-%m-%d'),
-                'rolling_return': rolling_value
-            })
-
-        funds_rolling.append({
-            'fund_id': fund_id,
-            'fund_name': fund['fund_name'],
-            'rolling_returns': rolling_list
-        })
+def _fund_rolling_returns(
+    data_store: DataStore,
+    fund_id: int,
+    fund_name: str,
+    request: RollingReturnsRequest,
+    response_format: ResponseFormat
+) -> Optional[dict]:
+    """Calculate and format rolling returns for one fund"""
+    returns_df = data_store.get_returns_by_fund_id(fund_id, request.start_date, request.end_date)
+    if returns_df is None or len(returns_df) == 0:
+        return None
 
+    # Calculate rolling returns
+    rolling_df = PerformanceCalculator.calculate_rolling_returns(returns_df, request.window_months)
+
+    # NaN/Inf values are serialized as null by the response class
     return {
+        'fund_id': fund_id,
+        'fund_name': fund_name,
+        'rolling_returns': format_series(rolling_df, ['rolling_return'], response_format)
+    }
+
+
+@router.post("/performance/rolling-returns")
+async def get_rolling_returns(
+    request: RollingReturnsRequest,
+    response_format: ResponseFormat = Query(ResponseFormat.records, alias="format"),
+    data_store: DataStore = Depends(get_store)
+):
+    """Get rolling returns for multiple funds"""
+    names_by_id = data_store.get_fund_names(request.fund_ids)
+
+    results = await asyncio.gather(*[
+        run_in_threadpool(
+            _fund_rolling_returns, data_store, fund_id, names_by_id[fund_id],
+            request, response_format
+        )
+        for fund_id in request.fund_ids
+        if fund_id in names_by_id
+    ])
+    funds_rolling = [result for result in results if result is not None]
+
+    return FastORJSONResponse({
         "funds": funds_rolling,
         "window_months": request.window_months
-    }
+    })
 
 
-@router.post("/risk/correlation-matrix", dependencies=[Depends(require_data)])
-async def get_correlation_matrix(request: CorrelationRequest):
-    """Get correlation matrix for multiple funds using monthly returns"""
-    data_store = DataStore()
+def _fund_correlation_returns(
+    data_store: DataStore,
+    fund_id: int,
+    request: CorrelationRequest
+) -> Optional[pd.DataFrame]:
+    """Get the returns window used for one fund of a correlation matrix"""
+    # Get returns using the same date range as performance calculations
+    returns_df = data_store.get_returns_by_fund_id(fund_id, request.start_date, request.end_date)
+    if returns_df is None or len(returns_df) == 0:
+        return None
 
-    funds_returns = {}
+    # If months parameter is provided and no explicit date range, use last N months
+    # (returns are sorted by date, so the window is a tail slice)
+    if request.start_date is None and request.end_date is None and request.months:
+        dates = returns_df['date'].to_numpy()
+        months_ago = months_before(dates[-1], request.months)
+        returns_df = returns_df.iloc[dates.searchsorted(months_ago, side='left'):]
 
-    for fund_id in request.fund_ids:
-        fund = data_store.get_fund_by_id(fund_id)
-        if fund is None:
-            continue
+    return returns_df
+
+
+@router.post("/risk/correlation-matrix")
+async def get_correlation_matrix(
+    request: CorrelationRequest,
+    response_format: ResponseFormat = Query(ResponseFormat.records, alias="format"),
+    data_store: DataStore = Depends(get_store)
+):
+    """
+    Get correlation matrix for multiple funds using monthly returns
 
-        # Get returns using the same date range as performance calculations
-        returns_df = data_store.get_returns_by_fund_id(fund_id, request.start_date, request.end_date)
-        if returns_df is None or len(returns_df) == 0:
-            continue
+    With format=columnar the matrix is returned as a list of rows
+    ordered like fund_names instead of a nested dict
+    """
+    names_by_id = data_store.get_fund_names(request.fund_ids)
+    fund_ids = [fund_id for fund_id in request.fund_ids if fund_id in names_by_id]
 
-        # If months parameter is provided and no explicit date range, use last N months
-        if request.start_date is None and request.end_date is None and request.months:
-            latest_date = returns_df['date'].max()
-            months_ago = latest_date - pd.DateOffset(months=request.months)
-            returns_df = returns_df[returns_df['date'] >= months_ago]
+    results = await asyncio.gather(*[
+        run_in_threadpool(_fund_correlation_returns, data_store, fund_id, request)
+        for fund_id in fund_ids
+    ])
 
-        funds_returns[fund['fund_name']] = returns_df
+    funds_returns = {}
+    for fund_id, returns_df in zip(fund_ids, results):
+        if returns_df is not None:
+            funds_returns[names_by_id[fund_id]] = returns_df
 
     if len(funds_returns) < 2:
-        return {
+        return FastORJSONResponse({
             "correlation_matrix": {},
             "fund_names": []
-        }
+        })
 
     # Calculate correlation matrix using monthly returns
     corr_matrix = RiskCalculator.calculate_correlation_matrix(funds_returns)
 
-    # Convert to dictionary format, handling NaN values
-    correlation_data = {}
     fund_names = list(corr_matrix.columns)
 
-    for fund1 in fund_names:
-        correlation_data[fund1] = {}
-        for fund2 in fund_names:
-            value = corr_matrix.loc[fund1, fund2]
-            # Replace NaN/Inf with None for JSON serialization
-            if pd.isna(value) or np.isinf(value):
-                correlation_data[fund1][fund2] = None
-            else:
-                correlation_data[fund1][fund2] = float(value)
+    if response_format == ResponseFormat.columnar:
+        # NaN/Inf values are serialized as null by the response class
+        return FastORJSONResponse({
+            "correlation_matrix": corr_matrix.to_numpy(),
+            "fund_names": fund_names
+        })
+
+    # Convert to dictionary format, replacing NaN/Inf with None
+    values = corr_matrix.to_numpy()
+    rows = np.where(np.isfinite(values), values, None).tolist()
+    correlation_data = {
+        fund1: dict(zip(fund_names, row)) for fund1, row in zip(fund_names, rows)
+    }
 
-    return {
+    return FastORJSONResponse({
         "correlation_matrix": correlation_data,
         "fund_names": fund_names
-    }
+    })
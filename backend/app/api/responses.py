@@ -0,0 +1,83 @@
+import decimal
+from enum import Enum
+from typing import Any, List, Union
+
+import numpy as np
+import orjson
+import pandas as pd
+from fastapi.responses import ORJSONResponse
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively"""
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        # Non-contiguous arrays are not serialized natively
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastORJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that serializes numpy arrays/scalars and pandas
+    timestamps natively, so handlers can return them without coercion
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
+
+class ResponseFormat(str, Enum):
+    """Layout of time-series payloads"""
+    records = "records"
+    columnar = "columnar"
+
+
+def format_series(
+    df: pd.DataFrame,
+    value_columns: List[str],
+    response_format: ResponseFormat = ResponseFormat.records
+) -> Union[List[dict], dict]:
+    """
+    Format a date-indexed series DataFrame for a JSON response
+
+    Args:
+        df: DataFrame with a 'date' column (and optionally a preformatted
+            'date_str' column) and the value columns
+        value_columns: Columns to emit alongside the date
+        response_format: 'records' for a list of {date, ...} objects,
+            'columnar' for a dict of parallel arrays
+
+    Returns:
+        List of records or dict of column arrays
+    """
+    if 'date_str' in df.columns:
+        # Preformatted by the data store at upload time
+        dates = df['date_str'].tolist()
+    else:
+        dates = np.datetime_as_string(df['date'].to_numpy(dtype='datetime64[D]')).tolist()
+
+    if response_format == ResponseFormat.columnar:
+        columns = {'date': dates}
+        columns.update({col: df[col].to_numpy() for col in value_columns})
+        return columns
+
+    # float32 values stay numpy scalars so orjson prints their shortest
+    # float32 repr instead of the widened float64 digits
+    keys = ['date'] + value_columns
+    values = [
+        df[col].to_numpy() if df[col].dtype == np.float32 else df[col].tolist()
+        for col in value_columns
+    ]
+    return [dict(zip(keys, row)) for row in zip(dates, *values)]
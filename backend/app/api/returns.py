@@ -1,12 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, List
+import asyncio
 from pydantic import BaseModel
-import pandas as pd
 from app.storage import DataStore
-from app.api.dependencies import require_data
+from app.api.dependencies import get_store
+from app.api.responses import FastORJSONResponse, ResponseFormat, format_series
 from app.utils.calculations import PerformanceCalculator
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastORJSONResponse)
 
 
 class MultipleReturnsRequest(BaseModel):
@@ -15,11 +17,13 @@ class MultipleReturnsRequest(BaseModel):
     end_date: Optional[str] = None
 
 
-@router.get("/returns/{fund_id}", dependencies=[Depends(require_data)])
-async def get_returns(
+@router.get("/returns/{fund_id}")
+def get_returns(
     fund_id: int,
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    response_format: ResponseFormat = Query(ResponseFormat.records, alias="format"),
+    data_store: DataStore = Depends(get_store)
 ):
     """
     Get monthly returns for a fund
@@ -28,12 +32,11 @@ async def get_returns(
         fund_id: Fund ID
         start_date: Optional start date (YYYY-MM-DD)
         end_date: Optional end date (YYYY-MM-DD)
+        format: 'records' (default) or 'columnar' for parallel arrays
 
     Returns:
         List of date/return pairs with cumulative returns
     """
-    data_store = DataStore()
-
     # Get fund info
     fund = data_store.get_fund_by_id(fund_id)
     if fund is None:
@@ -44,81 +47,86 @@ async def get_returns(
     if returns_df is None or len(returns_df) == 0:
         raise HTTPException(status_code=404, detail="No returns data found for this fund")
 
-    # Calculate cumulative returns
-    cumulative_df = PerformanceCalculator.calculate_cumulative_returns_series(returns_df)
-
-    # Merge with monthly returns
-    result_df = returns_df.merge(cumulative_df, on='date')
-    result_df = result_df.sort_values('date')
+    # Returns are already sorted by date, so cumulative returns line up
+    # with the monthly returns without a merge or re-sort
+    log_growth = data_store.get_log_growth_by_fund_id(fund_id, start_date, end_date)
+    result_df = returns_df.assign(
+        cumulative_return=PerformanceCalculator.calculate_cumulative_returns(returns_df, log_growth)
+    )
 
     # Format for response
-    returns_list = []
-    for _, row in result_df.iterrows():
-        returns_list.append({
-            'date': row['date'].strftime('%Y-%m-%d'),
-            'monthly_return': float(row['monthly_return']),
-            'cumulative_return': float(row['cumulative_return'])
-        })
+    returns_data = format_series(
+        result_df, ['monthly_return', 'cumulative_return'], response_format
+    )
 
-    return {
+    return FastORJSONResponse({
         "fund_id": fund_id,
         "fund_name": fund['fund_name'],
-        "returns": returns_list,
-        "start_date": result_df['date'].min().strftime('%Y-%m-%d'),
-        "end_date": result_df['date'].max().strftime('%Y-%m-%d'),
-        "total_periods": len(returns_list)
+        "returns": returns_data,
+        "start_date": result_df['date_str'].iat[0],
+        "end_date": result_df['date_str'].iat[-1],
+        "total_periods": len(result_df)
+    })
+
+
+def _fund_returns(
+    data_store: DataStore,
+    fund_id: int,
+    fund_name: str,
+    request: MultipleReturnsRequest,
+    response_format: ResponseFormat
+) -> Optional[dict]:
+    """Calculate and format returns for one fund of a multi-fund request"""
+    returns_df = data_store.get_returns_by_fund_id(fund_id, request.start_date, request.end_date)
+    if returns_df is None or len(returns_df) == 0:
+        return None
+
+    # Calculate cumulative returns (returns are already sorted by date)
+    log_growth = data_store.get_log_growth_by_fund_id(fund_id, request.start_date, request.end_date)
+    cumulative = PerformanceCalculator.calculate_cumulative_returns(returns_df, log_growth)
+
+    # Normalize cumulative returns to start at 0% for the selected period
+    result_df = returns_df.assign(cumulative_return=cumulative - cumulative[0])
+
+    return {
+        'fund_id': fund_id,
+        'fund_name': fund_name,
+        'returns': format_series(
+            result_df, ['monthly_return', 'cumulative_return'], response_format
+        )
     }
 
 
-@router.post("/returns/multiple", dependencies=[Depends(require_data)])
-async def get_multiple_returns(request: MultipleReturnsRequest):
+@router.post("/returns/multiple")
+async def get_multiple_returns(
+    request: MultipleReturnsRequest,
+    response_format: ResponseFormat = Query(ResponseFormat.records, alias="format"),
+    data_store: DataStore = Depends(get_store)
+):
     """
     Get returns for multiple funds
 
     Args:
         request: Request containing fund_ids, start_date, and end_date
+        format: 'records' (default) or 'columnar' for parallel arrays
 
     Returns:
         Returns data for all requested funds
     """
-    data_store = DataStore()
-
-    funds_returns = []
-
-    for fund_id in request.fund_ids:
-        fund = data_store.get_fund_by_id(fund_id)
-        if fund is None:
-            continue
-
-        returns_df = data_store.get_returns_by_fund_id(fund_id, request.start_date, request.end_date)
-        if returns_df is None or len(returns_df) == 0:
-            continue
-
-        # Calculate cumulative returns
-        cumulative_df = PerformanceCalculator.calculate_cumulative_returns_series(returns_df)
-        result_df = returns_df.merge(cumulative_df, on='date').sort_values('date')
-
-        # Normalize cumulative returns to start at 0% for the selected period
-        if len(result_df) > 0:
-            first_cumulative = result_df.iloc[0]['cumulative_return']
-            result_df['cumulative_return'] = result_df['cumulative_return'] - first_cumulative
-
-        returns_list = []
-        for _, row in result_df.iterrows():
-            returns_list.append({
-                'date': row['date'].strftime('%Y-%m-%d'),
-                'monthly_return': float(row['monthly_return']),
-                'cumulative_return': float(row['cumulative_return'])
-            })
-
-        funds_returns.append({
-            'fund_id': fund_id,
-            'fund_name': fund['fund_name'],
-            'returns': returns_list
-        })
-
-    return {
+    names_by_id = data_store.get_fund_names(request.fund_ids)
+
+    results = await asyncio.gather(*[
+        run_in_threadpool(
+            _fund_returns, data_store, fund_id, names_by_id[fund_id],
+            request, response_format
+        )
+        for fund_id in request.fund_ids
+        if fund_id in names_by_id
+    ])
+    funds_returns = [result for result in results if result is not None]
+
+    return FastORJSONResponse({
         "funds": funds_returns,
         "start_date": request.start_date,
         "end_date": request.end_date
-    }
+    })
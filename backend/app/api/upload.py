@@ -1,13 +1,18 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException
+from starlette.concurrency import run_in_threadpool
 from app.utils.parser import MorningstarParser
 from app.storage import DataStore
-import io
+from app.api import metrics
+from app.api.responses import FastORJSONResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastORJSONResponse)
 
 
 @router.post("/upload")
-async def upload_morningstar_file(file: UploadFile = File(...)):
+async def upload_morningstar_file(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...)
+):
     """
     Upload and parse Morningstar Excel file
 
@@ -22,23 +27,29 @@ async def upload_morningstar_file(file: UploadFile = File(...)):
         )
 
     try:
-        # Read file content
-        contents = await file.read()
-
-        # Parse the Excel file
+        # Parse straight from the upload's spooled temporary file
+        # rather than copying the whole file into memory
+        await file.seek(0)
+        # Parsing is CPU-bound, keep it off the event loop
         parser = MorningstarParser()
-        funds_df, returns_df = parser.parse_excel(io.BytesIO(contents))
+        funds_df, returns_df = await run_in_threadpool(parser.parse_excel, file.file)
 
         # Store in memory
         data_store = DataStore()
-        data_store.set_data(funds_df, returns_df)
+        await run_in_threadpool(data_store.set_data, funds_df, returns_df)
+        metrics.clear_caches()
+
+        # Precompute full-history metrics once the response is sent
+        background_tasks.add_task(
+            metrics.precompute_fund_metrics, data_store.data_version
+        )
 
         # Return summary
-        return {
+        return FastORJSONResponse({
             "status": "success",
             "message": "File uploaded and processed successfully",
             "summary": data_store.get_summary()
-        }
+        })
 
     except Exception as e:
         raise HTTPException(
@@ -53,16 +64,16 @@ async def get_data_status():
     data_store = DataStore()
 
     if not data_store.has_data():
-        return {
+        return FastORJSONResponse({
             "status": "no_data",
             "message": "No data loaded. Please upload a Morningstar Excel file."
-        }
+        })
 
     summary = data_store.get_summary()
-    return {
+    return FastORJSONResponse({
         "status": "data_loaded",
         "summary": summary
-    }
+    })
 
 
 @router.delete("/data")
@@ -70,8 +81,10 @@ async def clear_data():
     """Clear loaded data from memory"""
     data_store = DataStore()
     data_store.clear_data()
+    metrics.clear_caches()
+    MorningstarParser.clear_cache()
 
-    return {
+    return FastORJSONResponse({
         "status": "success",
         "message": "Data cleared successfully"
-    }
+    })
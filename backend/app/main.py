@@ -1,22 +1,49 @@
+import os
+from contextlib import asynccontextmanager
+import anyio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import upload, funds, returns, performance
+from app.api.caching import DataVersionETagMiddleware
+from app.api.responses import FastORJSONResponse
+from app.utils import kernels
+
+def configure_threadpool():
+    """Size the threadpool used for per-fund calculations to the host"""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(limiter.total_tokens, (os.cpu_count() or 1) * 4)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the threadpool and compile numeric kernels before the first request"""
+    configure_threadpool()
+    kernels.warm_up()
+    yield
+
 
 app = FastAPI(
     title="Fund Analysis API",
     description="API for analyzing mutual fund performance using Morningstar data",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=FastORJSONResponse,
+    lifespan=lifespan
 )
 
-# Configure CORS
+# Answer repeat GETs with 304 until the data changes
+app.add_middleware(DataVersionETagMiddleware)
+
+# Configure CORS (added last so it also wraps 304 responses)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],  # React dev server
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+
 # Include routers
 app.include_router(upload.router, prefix="/api", tags=["upload"])
 app.include_router(funds.router, prefix="/api", tags=["funds"])
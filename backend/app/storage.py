@@ -1,7 +1,22 @@
+import uuid
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 
+# Frames are handed out without defensive copies; this relies on the
+# Copy-on-Write mode enabled in app/__init__.py
+
+# Low-cardinality fund labels that are filtered on by equality
+CATEGORY_COLUMNS = ['Morningstar Category', 'ASISA Sector (South Africa)', 'Firm Name']
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_bound(value: str) -> np.datetime64:
+    """Parse a query date once; clients repeat the same few bounds"""
+    return pd.to_datetime(value).to_datetime64()
+
 
 class DataStore:
     """
@@ -12,7 +27,11 @@ class DataStore:
     _instance = None
     _funds_df: Optional[pd.DataFrame] = None
     _returns_df: Optional[pd.DataFrame] = None
+    _returns_by_fund: Optional[Dict[int, Dict]] = None
+    _fund_names_lower: Optional[pd.Series] = None
     _upload_timestamp: Optional[datetime] = None
+    _version: int = 0
+    _data_token: str = uuid.uuid4().hex
 
     def __new__(cls):
         if cls._instance is None:
@@ -21,17 +40,70 @@ class DataStore:
 
     def set_data(self, funds_df: pd.DataFrame, returns_df: pd.DataFrame):
         """Store funds and returns data"""
-        self._funds_df = funds_df.copy()
-        self._returns_df = returns_df.copy()
+        # Index by fund_id (keeping the column) so lookups are hash-based
+        self._funds_df = funds_df.set_index('fund_id', drop=False).rename_axis(None)
+        for col in CATEGORY_COLUMNS:
+            if col in self._funds_df.columns:
+                self._funds_df[col] = self._funds_df[col].astype('category')
+        self._fund_names_lower = self._funds_df['fund_name'].str.lower()
+
+        # Monthly returns only carry ~5 significant digits, so float32
+        # halves the memory without losing information (the parser already
+        # emits float32; other callers are downcast here)
+        self._returns_df = (
+            returns_df.astype({'monthly_return': np.float32})
+            .sort_values(['fund_id', 'date'], kind='mergesort')
+            .reset_index(drop=True)
+        )
+        self._returns_by_fund = self._index_returns(self._returns_df)
         self._upload_timestamp = datetime.now()
+        self._bump_version()
+
+    @staticmethod
+    def _index_returns(returns_df: pd.DataFrame) -> Dict[int, Dict]:
+        """
+        Split (fund_id, date)-sorted returns into per-fund column arrays
+
+        Each fund's rows are contiguous, so its arrays are views between
+        the offsets where fund_id changes rather than copies.
+        """
+        fund_ids = returns_df['fund_id'].to_numpy()
+        dates = returns_df['date'].to_numpy()
+        monthly_returns = returns_df['monthly_return'].to_numpy()
+        # Format dates once here rather than on every response. Funds share
+        # the same few hundred month ends, so each distinct date is formatted
+        # once and every row points at that one string object
+        unique_dates, date_positions = np.unique(dates, return_inverse=True)
+        date_strs = np.datetime_as_string(unique_dates, unit='D').astype(object)[date_positions]
+
+        unique_ids, starts = np.unique(fund_ids, return_index=True)
+        ends = np.append(starts[1:], len(fund_ids))
+        fund_names = returns_df['fund_name'].iloc[starts].tolist()
+
+        # Running sum of log growth per fund, so any period compounds with
+        # one subtraction instead of a product over its months
+        log_growth = np.log1p(monthly_returns.astype(np.float64) / 100)
+
+        returns_by_fund = {}
+        for fund_id, fund_name, start, end in zip(unique_ids.tolist(), fund_names, starts, ends):
+            log_growth_prefix = np.zeros(end - start + 1)
+            np.cumsum(log_growth[start:end], out=log_growth_prefix[1:])
+            returns_by_fund[fund_id] = {
+                'fund_name': fund_name,
+                'date': dates[start:end],
+                'date_str': date_strs[start:end],
+                'monthly_return': monthly_returns[start:end],
+                'log_growth_prefix': log_growth_prefix
+            }
+        return returns_by_fund
 
     def get_funds(self) -> Optional[pd.DataFrame]:
         """Get funds DataFrame"""
-        return self._funds_df.copy() if self._funds_df is not None else None
+        return self._funds_df
 
     def get_returns(self) -> Optional[pd.DataFrame]:
         """Get returns DataFrame"""
-        return self._returns_df.copy() if self._returns_df is not None else None
+        return self._returns_df
 
     def has_data(self) -> bool:
         """Check if data is loaded"""
@@ -41,7 +113,25 @@ class DataStore:
         """Clear all stored data"""
         self._funds_df = None
         self._returns_df = None
+        self._returns_by_fund = None
+        self._fund_names_lower = None
         self._upload_timestamp = None
+        self._bump_version()
+
+    def _bump_version(self):
+        """Mark the stored data as changed"""
+        self._version += 1
+        self._data_token = uuid.uuid4().hex
+
+    @property
+    def data_version(self) -> int:
+        """Counter that changes whenever the stored data changes"""
+        return self._version
+
+    @property
+    def data_token(self) -> str:
+        """Random token for the stored data, unique across server restarts"""
+        return self._data_token
 
     def get_summary(self) -> Dict:
         """Get summary of stored data"""
@@ -63,8 +153,45 @@ class DataStore:
         if self._funds_df is None:
             return None
 
-        fund = self._funds_df[self._funds_df['fund_id'] == fund_id]
-        return fund.iloc[0] if len(fund) > 0 else None
+        if fund_id not in self._funds_df.index:
+            return None
+
+        return self._funds_df.loc[fund_id]
+
+    def get_fund_ids(self) -> List[int]:
+        """Get the IDs of all stored funds"""
+        if self._funds_df is None:
+            return []
+
+        return self._funds_df.index.tolist()
+
+    def get_funds_by_ids(self, fund_ids: List[int]) -> Optional[pd.DataFrame]:
+        """Get the funds matching several IDs, in fund_id order"""
+        if self._funds_df is None:
+            return None
+
+        ids = self._funds_df.index.intersection(fund_ids).sort_values()
+        return self._funds_df.loc[ids]
+
+    def get_fund_names(self, fund_ids: List[int]) -> Dict[int, str]:
+        """Get fund names for several fund IDs"""
+        if self._funds_df is None:
+            return {}
+
+        ids = self._funds_df.index.intersection(fund_ids)
+        return dict(zip(ids, self._funds_df.loc[ids, 'fund_name']))
+
+    def match_fund_names(self, search: str) -> Optional[pd.Series]:
+        """
+        Case-insensitive substring match on fund names
+
+        Returns:
+            Boolean Series aligned with the funds DataFrame index
+        """
+        if self._fund_names_lower is None:
+            return None
+
+        return self._fund_names_lower.str.contains(search.lower(), regex=False, na=False)
 
     def get_returns_by_fund_id(
         self,
@@ -72,16 +199,70 @@ class DataStore:
         start_date: Optional[str] = None,
         end_date: Optional[str] = None
     ) -> Optional[pd.DataFrame]:
-        """Get returns for specific fund with optional date filtering"""
+        """
+        Get returns for specific fund with optional date filtering, sorted by date
+
+        Both bounds are inclusive. A bound with a timezone suffix is compared
+        as its UTC time (comparing it to the naive dates used to raise).
+        """
+        if self._returns_df is None:
+            return None
+
+        fund_returns = self._returns_by_fund.get(fund_id)
+        if fund_returns is None:
+            return self._returns_df.iloc[:0]
+
+        start, end = self._date_range(fund_returns['date'], start_date, end_date)
+
+        return pd.DataFrame({
+            'fund_id': fund_id,
+            'fund_name': fund_returns['fund_name'],
+            'date': fund_returns['date'][start:end],
+            'monthly_return': fund_returns['monthly_return'][start:end],
+            'date_str': fund_returns['date_str'][start:end]
+        })
+
+    def get_log_growth_by_fund_id(
+        self,
+        fund_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Get the running log growth prefix for the rows get_returns_by_fund_id
+        returns with the same arguments
+
+        Returns:
+            Array of one more value than there are returns in the range, for
+            PerformanceCalculator's log_growth arguments, or None if the
+            fund has no returns
+        """
         if self._returns_df is None:
             return None
 
-        returns = self._returns_df[self._returns_df['fund_id'] == fund_id].copy()
+        fund_returns = self._returns_by_fund.get(fund_id)
+        if fund_returns is None:
+            return None
+
+        start, end = self._date_range(fund_returns['date'], start_date, end_date)
+        return fund_returns['log_growth_prefix'][start:end + 1]
+
+    @staticmethod
+    def _date_range(
+        dates: np.ndarray,
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> Tuple[int, int]:
+        """Start and end offsets of a fund's returns within the date bounds"""
+        # Dates are sorted per fund, so the date range is a contiguous slice
+        start = 0
+        end = len(dates)
 
         if start_date:
-            returns = returns[returns['date'] >= pd.to_datetime(start_date)]
+            start = dates.searchsorted(_parse_date_bound(start_date), side='left')
 
         if end_date:
-            returns = returns[returns['date'] <= pd.to_datetime(end_date)]
+            end = dates.searchsorted(_parse_date_bound(end_date), side='right')
 
-        return returns
+        # A start after the end selects no rows
+        return start, max(start, end)
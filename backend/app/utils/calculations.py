@@ -1,11 +1,76 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import datetime
+from app.utils.kernels import rolling_annualized_returns
+
+# Standard trailing periods and their length in months
+PERIOD_MONTHS = {
+    '1M': 1,
+    '3M': 3,
+    '6M': 6,
+    '1Y': 12,
+    '3Y': 36,
+    '5Y': 60,
+    '10Y': 120
+}
+
+
+# Whole days representable as datetime64[ns]
+_MIN_NS_DAY = np.datetime64(pd.Timestamp.min.ceil('D'), 'D')
+_MAX_NS_DAY = np.datetime64(pd.Timestamp.max.floor('D'), 'D')
+
+
+def months_before(date: np.datetime64, months: Union[int, np.ndarray]) -> np.ndarray:
+    """
+    Same as date - pd.DateOffset(months=m) for each m, in integer month arithmetic
+
+    The day of month is clipped to the length of the target month
+    (e.g. 31 March minus one month is 28/29 February).
+
+    Args:
+        date: datetime64 timestamp
+        months: Month count or integer array of month counts
+
+    Returns:
+        datetime64[ns] shifted timestamp(s), shaped like months
+
+    Raises:
+        pd.errors.OutOfBoundsDatetime: If a shifted date falls outside the
+            datetime64[ns] range, as DateOffset does
+    """
+    date = np.datetime64(date, 'ns')
+    day = date.astype('datetime64[D]')
+    month = date.astype('datetime64[M]')
+
+    target_months = month - np.asarray(months)
+    month_starts = target_months.astype('datetime64[D]')
+    month_lengths = (target_months + 1).astype('datetime64[D]') - month_starts
+    day_offsets = np.minimum(day - month.astype('datetime64[D]'), month_lengths - 1)
+    target_days = month_starts + day_offsets
+
+    # Check in days, before the nanosecond conversion can wrap around
+    if np.any((target_days < _MIN_NS_DAY) | (target_days > _MAX_NS_DAY)):
+        raise pd.errors.OutOfBoundsDatetime(
+            f"{months} months before {day} is outside the supported date range"
+        )
+
+    return target_days.astype('datetime64[ns]') + (date - day)
+
+
+def sorted_by_date(returns_df: pd.DataFrame) -> pd.DataFrame:
+    """Returns sorted by date; store slices already are, so only other input is sorted"""
+    if returns_df['date'].is_monotonic_increasing:
+        return returns_df
+    return returns_df.sort_values('date')
 
 
 class PerformanceCalculator:
-    """Calculate fund performance metrics"""
+    """
+    Calculate fund performance metrics
+
+    Returns may be stored as float32, so they are compounded in float64.
+    """
 
     @staticmethod
     def calculate_total_return(returns: pd.Series) -> float:
@@ -22,7 +87,7 @@ class PerformanceCalculator:
             return 0.0
 
         # Convert to decimal and compound
-        cumulative = (1 + returns / 100).prod() - 1
+        cumulative = (1 + returns.astype(np.float64) / 100).prod() - 1
         return cumulative * 100
 
     @staticmethod
@@ -40,23 +105,44 @@ class PerformanceCalculator:
         if len(returns) == 0:
             return 0.0
 
-        total_return = PerformanceCalculator.calculate_total_return(returns)
-        n_periods = len(returns)
-        n_years = n_periods / periods_per_year
+        # Sum log growth rather than multiplying, so long series cannot
+        # overflow or underflow
+        log_growth = np.log1p(np.asarray(returns, dtype=np.float64) / 100).sum()
+        return np.expm1(log_growth * periods_per_year / len(returns)) * 100
 
-        if n_years == 0:
-            return 0.0
+    @staticmethod
+    def calculate_log_growth_prefix(returns_df: pd.DataFrame) -> np.ndarray:
+        """
+        Running log growth before each month of a date-sorted series
+
+        prefix[j] - prefix[i] is the log growth over months i..j-1, so any
+        contiguous period compounds as expm1 of one difference.
+
+        Calculators taking a log_growth argument compute this prefix when it
+        is omitted. A precomputed one, such as DataStore.get_log_growth_by_fund_id
+        for the same date range, must cover exactly the rows passed, and is
+        only valid for one fund's contiguous, date-sorted months.
+
+        Args:
+            returns_df: DataFrame with 'monthly_return' column, sorted by date
 
-        annualized = (((1 + total_return / 100) ** (1 / n_years)) - 1) * 100
-        return annualized
+        Returns:
+            Array of len(returns_df) + 1 running log growth values
+        """
+        log_growth = np.log1p(returns_df['monthly_return'].to_numpy(dtype=np.float64) / 100)
+        return np.concatenate(([0.0], np.cumsum(log_growth)))
 
     @staticmethod
-    def calculate_period_returns(returns_df: pd.DataFrame) -> Dict[str, Optional[float]]:
+    def calculate_period_returns(
+        returns_df: pd.DataFrame,
+        log_growth: Optional[np.ndarray] = None
+    ) -> Dict[str, Optional[float]]:
         """
         Calculate returns for standard periods (1M, 3M, 6M, 1Y, 3Y, 5Y, 10Y, ITD)
 
         Args:
             returns_df: DataFrame with 'date' and 'monthly_return' columns
+            log_growth: Optional precomputed prefix (see calculate_log_growth_prefix)
 
         Returns:
             Dictionary of period returns
@@ -64,41 +150,38 @@ class PerformanceCalculator:
         if len(returns_df) == 0:
             return {}
 
-        # Sort by date
-        returns_df = returns_df.sort_values('date')
-        latest_date = returns_df['date'].max()
+        returns_df = sorted_by_date(returns_df)
+
+        dates = returns_df['date'].to_numpy()
+        n_returns = len(dates)
+
+        # Every period ends at the latest month, so its return is a lookup
+        # at its start index
+        if log_growth is None:
+            log_growth = PerformanceCalculator.calculate_log_growth_prefix(returns_df)
 
-        periods = {
-            '1M': 1,
-            '3M': 3,
-            '6M': 6,
-            '1Y': 12,
-            '3Y': 36,
-            '5Y': 60,
-            '10Y': 120
-        }
+        # Locate every period's first month at once
+        start_dates = months_before(dates[-1], np.array(list(PERIOD_MONTHS.values())))
+        starts = dates.searchsorted(start_dates, side='right')
 
         period_returns = {}
 
-        for period_name, months in periods.items():
-            start_date = latest_date - pd.DateOffset(months=months)
-            period_data = returns_df[returns_df['date'] > start_date]['monthly_return']
+        for (period_name, months), start in zip(PERIOD_MONTHS.items(), starts):
+            n_periods = n_returns - start
 
-            if len(period_data) >= months:
+            if n_periods >= months:
+                period_log_growth = log_growth[-1] - log_growth[start]
                 if period_name in ['1M', '3M', '6M']:
                     # Cumulative return for short periods
-                    period_returns[period_name] = PerformanceCalculator.calculate_total_return(period_data)
+                    period_returns[period_name] = np.expm1(period_log_growth) * 100
                 else:
                     # Annualized for longer periods
-                    period_returns[period_name] = PerformanceCalculator.calculate_annualized_return(period_data)
+                    period_returns[period_name] = np.expm1(period_log_growth * 12 / n_periods) * 100
             else:
                 period_returns[period_name] = None
 
         # Inception to date (annualized)
-        if len(returns_df) > 0:
-            period_returns['ITD'] = PerformanceCalculator.calculate_annualized_return(
-                returns_df['monthly_return']
-            )
+        period_returns['ITD'] = np.expm1((log_growth[-1] - log_growth[0]) * 12 / n_returns) * 100
 
         return period_returns
 
@@ -116,15 +199,33 @@ class PerformanceCalculator:
         if len(returns_df) == 0:
             return {}
 
-        returns_df = returns_df.copy()
-        returns_df['year'] = returns_df['date'].dt.year
+        years = returns_df['date'].to_numpy().astype('datetime64[Y]').astype(int) + 1970
 
-        year_returns = {}
-        for year in sorted(returns_df['year'].unique()):
-            year_data = returns_df[returns_df['year'] == year]['monthly_return']
-            year_returns[int(year)] = PerformanceCalculator.calculate_total_return(year_data)
+        # Compound every year in one grouped pass
+        growth = 1 + returns_df['monthly_return'].to_numpy(dtype=np.float64) / 100
+        year_growth = pd.Series(growth).groupby(years).prod()
 
-        return year_returns
+        return dict(zip(year_growth.index.tolist(), ((year_growth - 1) * 100).tolist()))
+
+    @staticmethod
+    def calculate_cumulative_returns(
+        returns_df: pd.DataFrame,
+        log_growth: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Calculate cumulative return at each point of a date-sorted series
+
+        Args:
+            returns_df: DataFrame with 'date' and 'monthly_return' columns,
+                sorted by date
+            log_growth: Optional precomputed prefix (see calculate_log_growth_prefix)
+
+        Returns:
+            Array of cumulative returns (%)
+        """
+        if log_growth is None:
+            log_growth = PerformanceCalculator.calculate_log_growth_prefix(returns_df)
+        return np.expm1(log_growth[1:] - log_growth[0]) * 100
 
     @staticmethod
     def calculate_cumulative_returns_series(returns_df: pd.DataFrame) -> pd.DataFrame:
@@ -140,26 +241,22 @@ class PerformanceCalculator:
         if len(returns_df) == 0:
             return pd.DataFrame(columns=['date', 'cumulative_return'])
 
-        df = returns_df.sort_values('date').copy()
-
-        # Convert to decimal
-        decimal_returns = df['monthly_return'] / 100
-
-        # Calculate cumulative product
-        cumulative = (1 + decimal_returns).cumprod() - 1
-
-        # Convert back to percentage
-        df['cumulative_return'] = cumulative * 100
+        df = returns_df.sort_values('date')
+        df['cumulative_return'] = PerformanceCalculator.calculate_cumulative_returns(df)
 
         return df[['date', 'cumulative_return']]
 
     @staticmethod
-    def calculate_ytd_return(returns_df: pd.DataFrame) -> Optional[float]:
+    def calculate_ytd_return(
+        returns_df: pd.DataFrame,
+        log_growth: Optional[np.ndarray] = None
+    ) -> Optional[float]:
         """
         Calculate Year-To-Date return
 
         Args:
             returns_df: DataFrame with 'date' and 'monthly_return' columns
+            log_growth: Optional precomputed prefix (see calculate_log_growth_prefix)
 
         Returns:
             YTD return (%)
@@ -167,16 +264,15 @@ class PerformanceCalculator:
         if len(returns_df) == 0:
             return None
 
-        latest_date = returns_df['date'].max()
-        current_year = latest_date.year
-        year_start = pd.Timestamp(f'{current_year}-01-01')
+        returns_df = sorted_by_date(returns_df)
 
-        ytd_data = returns_df[returns_df['date'] >= year_start]['monthly_return']
-
-        if len(ytd_data) == 0:
-            return None
+        dates = returns_df['date'].to_numpy()
+        year_start = dates[-1].astype('datetime64[Y]').astype(dates.dtype)
+        start = dates.searchsorted(year_start, side='left')
 
-        return PerformanceCalculator.calculate_total_return(ytd_data)
+        if log_growth is None:
+            log_growth = PerformanceCalculator.calculate_log_growth_prefix(returns_df)
+        return np.expm1(log_growth[-1] - log_growth[start]) * 100
 
     @staticmethod
     def calculate_rolling_returns(
@@ -193,18 +289,16 @@ class PerformanceCalculator:
         Returns:
             DataFrame with date and rolling_return columns
         """
-        if len(returns_df) < window_months:
+        if window_months <= 0 or len(returns_df) < window_months:
             return pd.DataFrame(columns=['date', 'rolling_return'])
 
-        df = returns_df.sort_values('date').copy()
+        df = sorted_by_date(returns_df)
 
-        rolling_returns = []
-        for i in range(window_months - 1, len(df)):
-            window_data = df.iloc[i - window_months + 1:i + 1]['monthly_return']
-            rolling_return = PerformanceCalculator.calculate_annualized_return(window_data)
-            rolling_returns.append({
-                'date': df.iloc[i]['date'],
-                'rolling_return': rolling_return
-            })
+        rolling_returns = rolling_annualized_returns(
+            df['monthly_return'].to_numpy(), window_months
+        )
 
-        return pd.DataFrame(rolling_returns)
+        return pd.DataFrame({
+            'date': df['date'].to_numpy()[window_months - 1:],
+            'rolling_return': rolling_returns
+        })
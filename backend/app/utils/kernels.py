@@ -0,0 +1,187 @@
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, nogil=True)
+def rolling_annualized_returns(returns: np.ndarray, window: int) -> np.ndarray:
+    """
+    Annualized return over each trailing window of monthly returns
+
+    Keeps a running sum of log growth factors, adding the newest month
+    and dropping the oldest, so each step is constant time.
+
+    Args:
+        returns: Monthly returns (as percentages), sorted by date
+        window: Window size in months
+
+    Returns:
+        Annualized returns (%) for windows ending at index window-1 onwards
+    """
+    n = len(returns)
+    if window <= 0 or n < window:
+        return np.empty(0, dtype=np.float64)
+
+    out = np.empty(n - window + 1, dtype=np.float64)
+    log_growth = np.log1p(returns.astype(np.float64) / 100.0)
+    exponent = 12.0 / window
+
+    window_sum = 0.0
+    for i in range(window):
+        window_sum += log_growth[i]
+    out[0] = np.expm1(window_sum * exponent) * 100.0
+
+    for i in range(window, n):
+        window_sum += log_growth[i] - log_growth[i - window]
+        out[i - window + 1] = np.expm1(window_sum * exponent) * 100.0
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def drawdown_series(returns: np.ndarray) -> np.ndarray:
+    """
+    Drawdown from the running peak of the wealth index
+
+    Args:
+        returns: Monthly returns (as percentages), sorted by date
+
+    Returns:
+        Drawdown (%) at each point in time
+    """
+    n = len(returns)
+    out = np.empty(n, dtype=np.float64)
+
+    wealth = 100.0
+    peak = -np.inf
+    for i in range(n):
+        wealth *= 1.0 + returns[i] / 100.0
+        if wealth > peak:
+            peak = wealth
+        out[i] = (wealth - peak) / peak * 100.0
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def return_statistics(returns: np.ndarray):
+    """
+    Summary statistics of a return series in a single pass
+
+    Standard deviations use Welford's update, so they match the two-pass
+    sample (ddof=1) formula without its second read of the data.
+
+    Args:
+        returns: Monthly returns (as percentages)
+
+    Returns:
+        Tuple of (std, downside_std, best_index, worst_index, positive_count,
+        negative_count); the indices are of the first best and worst
+        returns (-1 if there are none), downside_std is the sample std of
+        the negative returns, and either std is NaN with fewer than two values
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    neg_count = 0
+    neg_mean = 0.0
+    neg_m2 = 0.0
+    pos_count = 0
+    best = -np.inf
+    worst = np.inf
+    best_index = -1
+    worst_index = -1
+
+    for i in range(len(returns)):
+        x = np.float64(returns[i])
+
+        count += 1
+        delta = x - mean
+        mean += delta / count
+        m2 += delta * (x - mean)
+
+        if x > best:
+            best = x
+            best_index = i
+        if x < worst:
+            worst = x
+            worst_index = i
+
+        if x > 0.0:
+            pos_count += 1
+        elif x < 0.0:
+            neg_count += 1
+            neg_delta = x - neg_mean
+            neg_mean += neg_delta / neg_count
+            neg_m2 += neg_delta * (x - neg_mean)
+
+    std = np.sqrt(m2 / (count - 1)) if count >= 2 else np.nan
+    downside_std = np.sqrt(neg_m2 / (neg_count - 1)) if neg_count >= 2 else np.nan
+
+    return std, downside_std, best_index, worst_index, pos_count, neg_count
+
+
+@njit(cache=True, nogil=True)
+def pairwise_correlation(matrix: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation between columns using pairwise-complete rows
+
+    Matches DataFrame.corr(): each pair only uses rows where both columns
+    are present, and is NaN with fewer than two such rows or zero variance.
+
+    Args:
+        matrix: (periods, funds) array of returns with NaN for missing values
+
+    Returns:
+        (funds, funds) correlation matrix
+    """
+    n_rows, n_cols = matrix.shape
+    out = np.empty((n_cols, n_cols), dtype=np.float64)
+
+    for a in range(n_cols):
+        for b in range(a, n_cols):
+            count = 0
+            sum_a = 0.0
+            sum_b = 0.0
+            for t in range(n_rows):
+                x = matrix[t, a]
+                y = matrix[t, b]
+                if not (np.isnan(x) or np.isnan(y)):
+                    count += 1
+                    sum_a += x
+                    sum_b += y
+
+            value = np.nan
+            if count >= 2:
+                mean_a = sum_a / count
+                mean_b = sum_b / count
+                cov = 0.0
+                var_a = 0.0
+                var_b = 0.0
+                for t in range(n_rows):
+                    x = matrix[t, a]
+                    y = matrix[t, b]
+                    if not (np.isnan(x) or np.isnan(y)):
+                        dx = x - mean_a
+                        dy = y - mean_b
+                        cov += dx * dy
+                        var_a += dx * dx
+                        var_b += dy * dy
+                if var_a > 0.0 and var_b > 0.0:
+                    value = cov / np.sqrt(var_a * var_b)
+                    # Clip rounding error to the valid range
+                    value = min(max(value, -1.0), 1.0)
+
+            out[a, b] = value
+            out[b, a] = value
+
+    return out
+
+
+def warm_up():
+    """Compile all kernels so the first request does not pay for it"""
+    for dtype in (np.float32, np.float64):
+        sample = np.zeros(3, dtype=dtype)
+        rolling_annualized_returns(sample, 2)
+        drawdown_series(sample)
+        return_statistics(sample)
+    pairwise_correlation(np.zeros((3, 2), dtype=np.float64))
@@ -1,10 +1,17 @@
+import hashlib
+import os
+import numpy as np
 import pandas as pd
-from typing import Tuple, List
+from typing import Dict, Tuple, List
 
 
 class MorningstarParser:
     """Parse Morningstar Excel files"""
 
+    # Result for the most recently parsed file, keyed by content hash, so
+    # uploading the same file again skips parsing
+    _cache: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = {}
+
     def parse_excel(self, file_obj) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Parse Morningstar Excel file and extract funds and returns data
@@ -13,10 +20,44 @@ class MorningstarParser:
             file_obj: File-like object or path to Excel file
 
         Returns:
-            Tuple of (funds_df, returns_df)
+            Tuple of (funds_df, returns_df); repeat parses of the same file
+            return the same frames, which must not be modified in place
         """
+        file_hash = self._file_hash(file_obj)
+        cached = MorningstarParser._cache.get(file_hash)
+        if cached is not None:
+            return cached
+
+        result = self._parse(file_obj)
+        MorningstarParser._cache = {file_hash: result}
+        return result
+
+    @staticmethod
+    def clear_cache():
+        """Drop the cached result, so cleared data is not kept in memory"""
+        MorningstarParser._cache = {}
+
+    @staticmethod
+    def _file_hash(file_obj) -> str:
+        """SHA-256 of the file contents, leaving a file object at its start"""
+        digest = hashlib.sha256()
+
+        if isinstance(file_obj, (str, os.PathLike)):
+            with open(file_obj, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        else:
+            file_obj.seek(0)
+            for chunk in iter(lambda: file_obj.read(1 << 20), b''):
+                digest.update(chunk)
+            file_obj.seek(0)
+
+        return digest.hexdigest()
+
+    def _parse(self, file_obj) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Read the workbook and split it into funds and returns"""
         # Read Excel with multi-level headers (rows 8 and 9)
-        df = pd.read_excel(file_obj, header=[7, 8])
+        df = pd.read_excel(file_obj, header=[7, 8], engine='calamine')
 
         # Separate static columns from date columns
         static_cols = [col for col in df.columns if 'Unnamed' in str(col[0])]
@@ -43,48 +84,42 @@ class MorningstarParser:
         # Rename primary column
         funds = funds.rename(columns={'Group/Investment': 'fund_name'})
 
-        # Add fund_id
-        funds['fund_id'] = range(1, len(funds) + 1)
+        # calamine keeps Windows line endings inside cell text
+        text_cols = funds.select_dtypes(include='object').columns
+        funds[text_cols] = funds[text_cols].replace('\r\n', '\n', regex=True)
 
-        # Move fund_id to first column
-        cols = ['fund_id'] + [col for col in funds.columns if col != 'fund_id']
-        funds = funds[cols]
+        # Add fund_id as the first column
+        funds.insert(0, 'fund_id', np.arange(1, len(funds) + 1, dtype=np.int64))
 
         return funds
 
     def _process_returns(self, df: pd.DataFrame, date_cols: List, funds_df: pd.DataFrame) -> pd.DataFrame:
         """Convert returns to long format with fund_id"""
-        returns_list = []
-
         # Create mapping of fund_name to fund_id
         fund_name_to_id = dict(zip(funds_df['fund_name'], funds_df['fund_id']))
 
-        for idx in range(len(df)):
-            fund_name = df.iloc[idx][('Unnamed: 0_level_0', 'Group/Investment')]
-
-            if pd.isna(fund_name) or fund_name == 'Local Funds':
-                continue
-
-            fund_id = fund_name_to_id.get(fund_name)
-            if fund_id is None:
-                continue
-
-            for date_col in date_cols:
-                return_value = df.iloc[idx][date_col]
-
-                if pd.notna(return_value):
-                    # Parse date
-                    date_str = date_col[0]
-                    date_obj = pd.to_datetime(date_str, format='%d/%m/%Y')
-
-                    returns_list.append({
-                        'fund_id': fund_id,
-                        'fund_name': fund_name,
-                        'date': date_obj,
-                        'monthly_return': float(return_value)
-                    })
-
-        returns_df = pd.DataFrame(returns_list)
+        # Rows without a known fund (blank, 'Local Funds' group rows) map to NaN
+        fund_names = df[('Unnamed: 0_level_0', 'Group/Investment')]
+        fund_ids = fund_names.map(fund_name_to_id)
+        keep = fund_ids.notna().to_numpy()
+        fund_names = fund_names.to_numpy()[keep]
+        fund_ids = fund_ids.to_numpy()[keep].astype(int)
+
+        # Parse each date header once rather than once per cell
+        dates = pd.to_datetime([date_col[0] for date_col in date_cols], format='%d/%m/%Y')
+
+        # Reshape the (fund, date) block to long format, skipping empty cells
+        values = df.loc[keep, date_cols].to_numpy(dtype=float)
+        rows, cols = np.nonzero(~np.isnan(values))
+
+        returns_df = pd.DataFrame({
+            'fund_id': fund_ids[rows],
+            # Repeated on every row, so stored as codes into one name per fund
+            'fund_name': pd.Categorical(fund_names)[rows],
+            'date': dates[cols],
+            # Monthly returns only carry ~5 significant digits
+            'monthly_return': values[rows, cols].astype(np.float32)
+        })
 
         # Sort by fund_id and date
         returns_df = returns_df.sort_values(['fund_id', 'date']).reset_index(drop=True)
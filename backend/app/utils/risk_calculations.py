@@ -1,7 +1,8 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, Optional
-from app.utils.calculations import PerformanceCalculator
+from app.utils.calculations import PerformanceCalculator, sorted_by_date
+from app.utils.kernels import drawdown_series, pairwise_correlation, return_statistics
 
 
 class RiskCalculator:
@@ -67,22 +68,13 @@ class RiskCalculator:
         if len(returns_df) == 0:
             return pd.DataFrame(columns=['date', 'drawdown'])
 
-        df = returns_df.sort_values('date').copy()
+        df = sorted_by_date(returns_df)
 
-        # Calculate cumulative returns
-        cumulative_returns = PerformanceCalculator.calculate_cumulative_returns_series(df)
-
-        # Convert to wealth index (starting at 100)
-        wealth_index = 100 * (1 + cumulative_returns['cumulative_return'] / 100)
-
-        # Calculate running maximum
-        running_max = wealth_index.expanding().max()
-
-        # Calculate drawdown
-        drawdown = ((wealth_index - running_max) / running_max * 100).values
+        # Wealth index, running peak and drawdown in a single compiled pass
+        drawdown = drawdown_series(df['monthly_return'].to_numpy())
 
         return pd.DataFrame({
-            'date': cumulative_returns['date'],
+            'date': df['date'].to_numpy(),
             'drawdown': drawdown
         })
 
@@ -117,35 +109,30 @@ class RiskCalculator:
                 'duration_months': 0
             }
 
-        max_dd = drawdown_df['drawdown'].min()
-        max_dd_idx = drawdown_df['drawdown'].idxmin()
-        max_dd_date = drawdown_df.loc[max_dd_idx, 'date']
-
-        # Find peak before max drawdown
-        pre_dd = drawdown_df.loc[:max_dd_idx]
-        peak_candidates = pre_dd[pre_dd['drawdown'] == 0]
-        if len(peak_candidates) > 0:
-            peak_date = peak_candidates['date'].iloc[-1]
-        else:
-            peak_date = drawdown_df['date'].iloc[0]
-
-        # Find recovery date (if recovered)
-        post_dd = drawdown_df.loc[max_dd_idx:]
-        recovery_candidates = post_dd[post_dd['drawdown'] == 0]
-        if len(recovery_candidates) > 0:
-            recovery_date = recovery_candidates['date'].iloc[0]
-        else:
-            recovery_date = None
-
-        # Calculate duration
-        peak_idx = drawdown_df[drawdown_df['date'] == peak_date].index[0]
+        drawdown = drawdown_df['drawdown'].to_numpy()
+        dates = drawdown_df['date'].to_numpy()
+
+        max_dd_idx = int(drawdown.argmin())
+        at_peak = drawdown == 0
+
+        # Peak is the last point at the running high before the trough
+        pre_peaks = np.flatnonzero(at_peak[:max_dd_idx + 1])
+        peak_idx = int(pre_peaks[-1]) if len(pre_peaks) > 0 else 0
+
+        # Recovery is the first point back at the running high after it
+        post_peaks = np.flatnonzero(at_peak[max_dd_idx:])
+        recovery_idx = max_dd_idx + int(post_peaks[0]) if len(post_peaks) > 0 else None
+
         duration_months = max_dd_idx - peak_idx if max_dd_idx > peak_idx else 0
 
+        def format_date(idx: Optional[int]) -> Optional[str]:
+            return str(np.datetime_as_string(dates[idx], unit='D')) if idx is not None else None
+
         return {
-            'max_drawdown': float(max_dd),
-            'peak_date': peak_date.strftime('%Y-%m-%d') if peak_date is not pd.NaT else None,
-            'trough_date': max_dd_date.strftime('%Y-%m-%d') if max_dd_date is not pd.NaT else None,
-            'recovery_date': recovery_date.strftime('%Y-%m-%d') if recovery_date and recovery_date is not pd.NaT else None,
+            'max_drawdown': float(drawdown[max_dd_idx]),
+            'peak_date': format_date(peak_idx),
+            'trough_date': format_date(max_dd_idx),
+            'recovery_date': format_date(recovery_idx),
             'duration_months': int(duration_months)
         }
 
@@ -217,16 +204,32 @@ class RiskCalculator:
             return {}
 
         returns = returns_df['monthly_return']
+        returns_array = returns.to_numpy()
+
+        # Dispersion, extremes and counts in one compiled pass
+        std, downside_std, best_index, worst_index, positive, negative = return_statistics(
+            returns_array
+        )
+        volatility = std * np.sqrt(12) if len(returns) >= 2 else 0.0
+        downside_deviation = downside_std * np.sqrt(12) if negative >= 2 else 0.0
+
+        # Sharpe and Sortino share the annualized excess return
+        excess_return = 0.0
+        if len(returns) >= 2:
+            excess_return = PerformanceCalculator.calculate_annualized_return(
+                returns - (risk_free_rate / 12)
+            )
 
         metrics = {
-            'volatility': RiskCalculator.calculate_volatility(returns),
-            'downside_deviation': RiskCalculator.calculate_downside_deviation(returns),
-            'best_month': float(returns.max()),
-            'worst_month': float(returns.min()),
-            'positive_months': int((returns > 0).sum()),
-            'negative_months': int((returns < 0).sum()),
-            'sharpe_ratio': RiskCalculator.calculate_sharpe_ratio(returns, risk_free_rate),
-            'sortino_ratio': RiskCalculator.calculate_sortino_ratio(returns, risk_free_rate)
+            'volatility': float(volatility),
+            'downside_deviation': float(downside_deviation),
+            # Stored scalars, so float32 returns serialize without widened digits
+            'best_month': returns_array[best_index],
+            'worst_month': returns_array[worst_index],
+            'positive_months': int(positive),
+            'negative_months': int(negative),
+            'sharpe_ratio': float(excess_return / volatility) if volatility != 0 else 0.0,
+            'sortino_ratio': float(excess_return / downside_deviation) if downside_deviation != 0 else 0.0
         }
 
         # Add max drawdown metrics
@@ -241,7 +244,7 @@ class RiskCalculator:
         Calculate correlation matrix for multiple funds
 
         Args:
-            funds_returns: Dictionary mapping fund_id to returns DataFrame
+            funds_returns: Dictionary mapping fund name to returns DataFrame
 
         Returns:
             Correlation matrix as DataFrame
@@ -249,22 +252,17 @@ class RiskCalculator:
         if len(funds_returns) < 2:
             return pd.DataFrame()
 
-        # Align all returns by date
-        all_dates = set()
-        for returns_df in funds_returns.values():
-            all_dates.update(returns_df['date'].values)
-
-        all_dates = sorted(all_dates)
-
-        # Build a DataFrame with one column per fund
-        returns_matrix = pd.DataFrame()
-        for fund_name, returns_df in funds_returns.items():
-            returns_dict = {row['date']: row['monthly_return'] for _, row in returns_df.iterrows()}
-            returns_matrix[fund_name] = [returns_dict.get(date, np.nan) for date in all_dates]
+        fund_names = list(funds_returns.keys())
+        fund_dates = [returns_df['date'].to_numpy() for returns_df in funds_returns.values()]
 
-        returns_matrix.index = all_dates
+        # Align all returns by date into one dense (dates, funds) matrix
+        all_dates = np.unique(np.concatenate(fund_dates))
+        returns_matrix = np.full((len(all_dates), len(fund_names)), np.nan)
+        for col, (dates, returns_df) in enumerate(zip(fund_dates, funds_returns.values())):
+            rows = np.searchsorted(all_dates, dates)
+            returns_matrix[rows, col] = returns_df['monthly_return'].to_numpy()
 
-        # Calculate correlation matrix
-        correlation = returns_matrix.corr()
+        # Calculate pairwise-complete correlation matrix
+        correlation = pairwise_correlation(returns_matrix)
 
-        return correlation
+        return pd.DataFrame(correlation, index=fund_names, columns=fund_names)
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api import metrics
+from app.storage import DataStore
+
+
+def make_fund_data(n_funds: int = 3, n_months: int = 48):
+    """Small funds/returns frames shaped like the parser's output"""
+    funds_df = pd.DataFrame({
+        'fund_id': np.arange(1, n_funds + 1),
+        'fund_name': [f'Fund {i}' for i in range(1, n_funds + 1)],
+        'ISIN': [f'ZAE00000000{i}' for i in range(1, n_funds + 1)],
+    })
+
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2020-01-31', periods=n_months, freq='ME')
+    returns_df = pd.DataFrame({
+        'fund_id': np.repeat(funds_df['fund_id'].to_numpy(), n_months),
+        'fund_name': np.repeat(funds_df['fund_name'].to_numpy(), n_months),
+        'date': np.tile(dates, n_funds),
+        'monthly_return': rng.normal(0.5, 3.0, n_funds * n_months).round(3).astype(np.float32),
+    })
+    return funds_df, returns_df
+
+
+@pytest.fixture
+def client():
+    """TestClient with synthetic fund data loaded into the store"""
+    DataStore().set_data(*make_fund_data())
+    metrics.clear_caches()
+    yield TestClient(app)
+    DataStore().clear_data()
+    metrics.clear_caches()
@@ -0,0 +1,69 @@
+from pathlib import Path
+from app.storage import DataStore
+from app.utils.parser import MorningstarParser
+
+SAMPLE_FILE = Path(__file__).resolve().parents[2] / 'Morningstar_Data (Short).xlsx'
+
+
+def test_get_response_carries_etag(client):
+    """Test that successful GETs are tagged with the data set and must be revalidated"""
+    response = client.get('/api/funds/1')
+
+    assert response.status_code == 200
+    assert response.headers['etag'] == f'W/"{DataStore().data_token}"'
+    assert response.headers['cache-control'] == 'private, no-cache'
+
+
+def test_matching_if_none_match_skips_handler(client, monkeypatch):
+    """Test that a matching tag, alone or in a list, gets a 304 without running the handler"""
+    etag = client.get('/api/funds/1').headers['etag']
+    calls = []
+    get_fund_by_id = DataStore.get_fund_by_id
+
+    def counting_get_fund_by_id(self, fund_id):
+        calls.append(fund_id)
+        return get_fund_by_id(self, fund_id)
+
+    monkeypatch.setattr(DataStore, 'get_fund_by_id', counting_get_fund_by_id)
+
+    for if_none_match in [etag, f'W/"other", {etag}']:
+        response = client.get('/api/funds/1', headers={'If-None-Match': if_none_match})
+
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+    assert calls == []
+
+    response = client.get('/api/funds/1', headers={'If-None-Match': 'W/"other"'})
+    assert response.status_code == 200
+    assert calls == [1]
+
+
+def test_clear_and_upload_change_etag(client):
+    """Test that clearing or uploading data invalidates earlier tags"""
+    etag = client.get('/api/data-status').headers['etag']
+
+    assert client.delete('/api/data').status_code == 200
+    cleared_etag = client.get('/api/data-status').headers['etag']
+    assert cleared_etag != etag
+
+    with open(SAMPLE_FILE, 'rb') as f:
+        response = client.post('/api/upload', files={'file': (SAMPLE_FILE.name, f)})
+    assert response.status_code == 200
+    MorningstarParser.clear_cache()
+
+    response = client.get('/api/data-status', headers={'If-None-Match': cleared_etag})
+    assert response.status_code == 200
+    assert response.headers['etag'] not in (etag, cleared_etag)
+
+
+def test_non_get_and_error_responses_are_untagged(client):
+    """Test that only successful GET responses carry an ETag"""
+    response = client.post('/api/risk/correlation-matrix', json={'fund_ids': [1, 2]})
+    assert response.status_code == 200
+    assert 'etag' not in response.headers
+
+    response = client.get('/api/funds/999')
+    assert response.status_code == 404
+    assert 'etag' not in response.headers
+    assert 'cache-control' not in response.headers
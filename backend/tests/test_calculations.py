@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.storage import DataStore
+from app.utils.calculations import PERIOD_MONTHS, PerformanceCalculator, months_before
+
+
+def test_months_before_matches_date_offset():
+    """Test integer month arithmetic against pd.DateOffset, including month-end clipping"""
+    months = np.array([1, 3, 6, 12, 36, 60, 120])
+    dates = pd.to_datetime(['2024-03-31', '2024-02-29', '2023-05-15 12:30', '2020-12-31'], format='ISO8601')
+
+    for date in dates:
+        expected = [(date - pd.DateOffset(months=int(m))).to_datetime64() for m in months]
+        np.testing.assert_array_equal(months_before(date.to_datetime64(), months), expected)
+
+
+def test_months_before_out_of_range_raises():
+    """Test that shifts past the datetime64[ns] range raise instead of wrapping"""
+    date = np.datetime64('2025-01-31')
+
+    with pytest.raises(pd.errors.OutOfBoundsDatetime):
+        months_before(date, 4500)
+    with pytest.raises(pd.errors.OutOfBoundsDatetime):
+        months_before(date, -3000)
+
+
+def test_cumulative_returns_from_log_growth():
+    """Test log-growth cumulative returns with and without a precomputed prefix"""
+    returns = np.array([1.0, -2.0, 3.0, 0.5], dtype=np.float32)
+    returns_df = pd.DataFrame({
+        'date': pd.date_range('2020-01-31', periods=4, freq='ME'),
+        'monthly_return': returns
+    })
+    expected = (np.cumprod(1 + returns.astype(np.float64) / 100) - 1) * 100
+
+    np.testing.assert_allclose(PerformanceCalculator.calculate_cumulative_returns(returns_df), expected)
+
+    # A later slice of a fund, with the prefix running from its inception
+    log_growth = np.cumsum(np.log1p(np.array([0.0, 5.0, *returns], dtype=np.float64) / 100))[1:]
+    np.testing.assert_allclose(
+        PerformanceCalculator.calculate_cumulative_returns(returns_df, log_growth), expected
+    )
+
+
+def test_store_log_growth_matches_row_filtered_returns(client):
+    """Test that store slices carry no prefix that row-filtered copies would misuse"""
+    data_store = DataStore()
+    returns_df = data_store.get_returns_by_fund_id(1, '2021-01-31', '2022-12-31')
+    log_growth = data_store.get_log_growth_by_fund_id(1, '2021-01-31', '2022-12-31')
+
+    assert len(log_growth) == len(returns_df) + 1
+    np.testing.assert_allclose(
+        PerformanceCalculator.calculate_cumulative_returns(returns_df, log_growth),
+        PerformanceCalculator.calculate_cumulative_returns(returns_df)
+    )
+
+    positive_df = returns_df[returns_df['monthly_return'] > 0]
+    growth = 1 + positive_df['monthly_return'].to_numpy(dtype=np.float64) / 100
+    np.testing.assert_allclose(
+        PerformanceCalculator.calculate_cumulative_returns(positive_df),
+        (np.cumprod(growth) - 1) * 100
+    )
+
+
+def _compound(returns: np.ndarray) -> float:
+    """Cumulative return (%) by direct compounding"""
+    return (np.prod(1 + returns.astype(np.float64) / 100) - 1) * 100
+
+
+def _expected_period_returns(returns_df: pd.DataFrame) -> dict:
+    """Period returns compounded month by month over each trailing window"""
+    latest = returns_df['date'].max()
+    expected = {}
+    for period_name, months in PERIOD_MONTHS.items():
+        window = returns_df[returns_df['date'] > latest - pd.DateOffset(months=months)]
+        if len(window) < months:
+            expected[period_name] = None
+            continue
+        total_return = _compound(window['monthly_return'].to_numpy())
+        if months >= 12:
+            total_return = ((1 + total_return / 100) ** (12 / len(window)) - 1) * 100
+        expected[period_name] = total_return
+
+    itd_return = _compound(returns_df['monthly_return'].to_numpy())
+    expected['ITD'] = ((1 + itd_return / 100) ** (12 / len(returns_df)) - 1) * 100
+    return expected
+
+
+def _assert_returns_close(actual: dict, expected: dict):
+    """Compare return dicts, with None for periods that were not filled"""
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if value is None:
+            assert actual[key] is None, key
+        else:
+            np.testing.assert_allclose(actual[key], value, err_msg=str(key))
+
+
+def test_period_returns_match_direct_compounding(client):
+    """Test period returns on full and date-filtered store slices"""
+    data_store = DataStore()
+
+    for start_date, end_date in [(None, None), ('2021-03-31', '2023-08-31'), ('2022-06-30', None)]:
+        returns_df = data_store.get_returns_by_fund_id(2, start_date, end_date)
+        log_growth = data_store.get_log_growth_by_fund_id(2, start_date, end_date)
+        expected = _expected_period_returns(returns_df)
+
+        _assert_returns_close(PerformanceCalculator.calculate_period_returns(returns_df), expected)
+        _assert_returns_close(
+            PerformanceCalculator.calculate_period_returns(returns_df, log_growth), expected
+        )
+
+    # 30 months: 3Y and longer are shorter than their window
+    returns_df = data_store.get_returns_by_fund_id(2, '2021-07-31', None)
+    period_returns = PerformanceCalculator.calculate_period_returns(returns_df)
+    assert period_returns['1Y'] is not None
+    assert period_returns['3Y'] is None
+    assert period_returns['5Y'] is None
+    assert period_returns['10Y'] is None
+
+
+def test_period_returns_single_month():
+    """Test that a single month only fills 1M and ITD"""
+    returns_df = pd.DataFrame({
+        'date': pd.to_datetime(['2024-03-31']),
+        'monthly_return': np.array([2.5], dtype=np.float32)
+    })
+
+    period_returns = PerformanceCalculator.calculate_period_returns(returns_df)
+
+    np.testing.assert_allclose(period_returns['1M'], 2.5)
+    assert all(period_returns[name] is None for name in ['3M', '6M', '1Y', '3Y', '5Y', '10Y'])
+    np.testing.assert_allclose(period_returns['ITD'], (1.025 ** 12 - 1) * 100)
+    np.testing.assert_allclose(PerformanceCalculator.calculate_ytd_return(returns_df), 2.5)
+    _assert_returns_close(PerformanceCalculator.calculate_calendar_year_returns(returns_df), {2024: 2.5})
+
+
+def test_ytd_and_calendar_year_returns_match_direct_compounding(client):
+    """Test YTD and calendar year returns on full and date-filtered store slices"""
+    data_store = DataStore()
+
+    for start_date, end_date in [(None, None), ('2020-06-30', '2022-03-31'), ('2021-01-31', '2021-12-31')]:
+        returns_df = data_store.get_returns_by_fund_id(3, start_date, end_date)
+        log_growth = data_store.get_log_growth_by_fund_id(3, start_date, end_date)
+        years = returns_df['date'].dt.year
+        monthly_returns = returns_df['monthly_return'].to_numpy()
+
+        expected_ytd = _compound(monthly_returns[years == years.iat[-1]])
+        np.testing.assert_allclose(PerformanceCalculator.calculate_ytd_return(returns_df), expected_ytd)
+        np.testing.assert_allclose(
+            PerformanceCalculator.calculate_ytd_return(returns_df, log_growth), expected_ytd
+        )
+
+        expected_years = {year: _compound(monthly_returns[years == year]) for year in years.unique()}
+        _assert_returns_close(
+            PerformanceCalculator.calculate_calendar_year_returns(returns_df), expected_years
+        )
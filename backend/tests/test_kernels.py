@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from app.utils.kernels import (
+    rolling_annualized_returns,
+    drawdown_series,
+    return_statistics,
+    pairwise_correlation
+)
+
+
+def test_rolling_annualized_returns_matches_compounding():
+    """Test rolling windows against direct compounding"""
+    returns = np.array([1.0, -2.0, 3.0, 0.5, -1.5, 2.5])
+    window = 3
+
+    result = rolling_annualized_returns(returns, window)
+
+    expected = [
+        ((1 + returns[i - window + 1:i + 1] / 100).prod() ** (12 / window) - 1) * 100
+        for i in range(window - 1, len(returns))
+    ]
+    np.testing.assert_allclose(result, expected)
+
+
+def test_rolling_annualized_returns_short_series():
+    """Test that a series shorter than the window yields no values"""
+    assert len(rolling_annualized_returns(np.array([1.0, 2.0]), 3)) == 0
+
+
+def test_drawdown_series():
+    """Test drawdown against the running peak of the wealth index"""
+    returns = np.array([10.0, -10.0, 5.0, 20.0])
+
+    wealth = 100 * (1 + returns / 100).cumprod()
+    running_max = np.maximum.accumulate(wealth)
+    expected = (wealth - running_max) / running_max * 100
+
+    np.testing.assert_allclose(drawdown_series(returns), expected)
+
+
+def test_drawdown_series_float32_input():
+    """Test that stored float32 returns are compounded in float64"""
+    returns = np.array([10.0, -10.0, 5.0, 20.0], dtype=np.float32)
+
+    result = drawdown_series(returns)
+
+    assert result.dtype == np.float64
+    np.testing.assert_array_equal(result, drawdown_series(returns.astype(np.float64)))
+
+
+def test_return_statistics_matches_numpy():
+    """Test the single-pass statistics against separate numpy reductions"""
+    returns = np.random.default_rng(0).normal(0.5, 4.0, 240)
+    negative = returns[returns < 0]
+
+    std, downside_std, best_index, worst_index, positive_count, negative_count = return_statistics(returns)
+
+    np.testing.assert_allclose(std, returns.std(ddof=1))
+    np.testing.assert_allclose(downside_std, negative.std(ddof=1))
+    assert best_index == returns.argmax()
+    assert worst_index == returns.argmin()
+    assert positive_count == (returns > 0).sum()
+    assert negative_count == len(negative)
+
+
+def test_pairwise_correlation_matches_pandas():
+    """Test correlation with missing values against DataFrame.corr"""
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(60, 4))
+    matrix[rng.random(matrix.shape) < 0.2] = np.nan
+
+    expected = pd.DataFrame(matrix).corr().to_numpy()
+
+    np.testing.assert_allclose(pairwise_correlation(matrix), expected)
@@ -0,0 +1,63 @@
+from pathlib import Path
+from app.api import metrics
+from app.storage import DataStore
+from app.utils.parser import MorningstarParser
+from tests.conftest import make_fund_data
+
+SAMPLE_FILE = Path(__file__).resolve().parents[2] / 'Morningstar_Data (Short).xlsx'
+
+
+def test_cached_metrics_follow_new_data(client):
+    """Test that cached results are not served after new returns are stored"""
+    performance = client.get('/api/performance/1').json()['performance']
+    risk_metrics = client.get('/api/risk/1').json()['risk_metrics']
+    assert metrics.get_period_performance.cache_info().currsize == 1
+    assert metrics.get_risk_metrics.cache_info().currsize == 1
+
+    funds_df, returns_df = make_fund_data()
+    DataStore().set_data(funds_df, returns_df.assign(monthly_return=returns_df['monthly_return'] + 1))
+
+    assert client.get('/api/performance/1').json()['performance'] != performance
+    assert client.get('/api/risk/1').json()['risk_metrics'] != risk_metrics
+
+
+def test_precompute_fills_both_caches(client):
+    """Test that precomputing caches every fund's full-history results"""
+    data_store = DataStore()
+    n_funds = len(data_store.get_fund_ids())
+
+    metrics.precompute_fund_metrics(data_store.data_version)
+
+    assert metrics.get_period_performance.cache_info().currsize == n_funds
+    assert metrics.get_risk_metrics.cache_info().currsize == n_funds
+
+    client.get('/api/performance/1')
+    client.get('/api/risk/1')
+    assert metrics.get_period_performance.cache_info().hits == 1
+    assert metrics.get_risk_metrics.cache_info().hits == 1
+
+    metrics.clear_caches()
+    assert metrics.get_period_performance.cache_info().currsize == 0
+    assert metrics.get_risk_metrics.cache_info().currsize == 0
+
+
+def test_precompute_skips_outdated_version(client):
+    """Test that a precompute queued before a newer upload caches nothing"""
+    metrics.precompute_fund_metrics(DataStore().data_version - 1)
+
+    assert metrics.get_period_performance.cache_info().currsize == 0
+    assert metrics.get_risk_metrics.cache_info().currsize == 0
+
+
+def test_upload_precomputes_metrics(client):
+    """Test that an upload clears old results and precomputes the new data's"""
+    client.get('/api/performance/1')
+
+    with open(SAMPLE_FILE, 'rb') as f:
+        response = client.post('/api/upload', files={'file': (SAMPLE_FILE.name, f)})
+    assert response.status_code == 200
+    MorningstarParser.clear_cache()
+
+    n_funds = len(DataStore().get_fund_ids())
+    assert metrics.get_period_performance.cache_info().currsize == n_funds
+    assert metrics.get_risk_metrics.cache_info().currsize == n_funds
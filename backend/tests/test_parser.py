@@ -1,3 +1,6 @@
+import io
+import numpy as np
+import pandas as pd
 import pytest
 from app.utils.parser import MorningstarParser
 
@@ -8,6 +11,52 @@ def test_parser_initialization():
     assert parser is not None
 
 
+def test_process_returns_long_format():
+    """Test that the returns block is reshaped to one row per fund and month"""
+    name_col = ('Unnamed: 0_level_0', 'Group/Investment')
+    date_cols = [('31/01/2020', 'Monthly Return'), ('29/02/2020', 'Monthly Return')]
+    df = pd.DataFrame({
+        name_col: ['Fund B', 'Local Funds', 'Fund A', np.nan],
+        date_cols[0]: [1.5, 9.0, np.nan, 9.0],
+        date_cols[1]: [-0.5, 9.0, 2.0, 9.0],
+    })
+    funds_df = pd.DataFrame({'fund_id': [1, 2], 'fund_name': ['Fund A', 'Fund B']})
+
+    returns_df = MorningstarParser()._process_returns(df, date_cols, funds_df)
+
+    assert returns_df['fund_id'].tolist() == [1, 2, 2]
+    assert returns_df['fund_name'].tolist() == ['Fund A', 'Fund B', 'Fund B']
+    assert returns_df['date'].dt.strftime('%Y-%m-%d').tolist() == [
+        '2020-02-29', '2020-01-31', '2020-02-29'
+    ]
+    assert returns_df['monthly_return'].dtype == np.float32
+    assert returns_df['monthly_return'].tolist() == [2.0, 1.5, -0.5]
+
+
+def test_parse_excel_caches_latest_file(monkeypatch, client):
+    """Test that repeat parses of the same bytes reuse the frames until cleared"""
+    parsed = []
+
+    def fake_parse(self, file_obj):
+        parsed.append(file_obj.read())
+        return pd.DataFrame(), pd.DataFrame()
+
+    monkeypatch.setattr(MorningstarParser, '_parse', fake_parse)
+    MorningstarParser.clear_cache()
+    parser = MorningstarParser()
+
+    first = parser.parse_excel(io.BytesIO(b'first file'))
+    assert parser.parse_excel(io.BytesIO(b'first file')) is first
+    assert parser.parse_excel(io.BytesIO(b'second file')) is not first
+    assert parsed == [b'first file', b'second file']
+
+    # Clearing the data also drops the cached frames
+    assert client.delete('/api/data').status_code == 200
+    assert parser.parse_excel(io.BytesIO(b'second file')) is not first
+    assert len(parsed) == 3
+    MorningstarParser.clear_cache()
+
+
 # Additional tests will be added as we develop
 # Test with actual Morningstar file structure
 # Test error handling
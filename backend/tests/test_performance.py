@@ -0,0 +1,41 @@
+import pytest
+from app.storage import DataStore
+
+
+@pytest.mark.parametrize('months', [4500, -1])
+def test_correlation_rejects_out_of_range_months(client, months):
+    """Test that the correlation lookback must be a non-negative, bounded month count"""
+    response = client.post(
+        '/api/risk/correlation-matrix', json={'fund_ids': [1, 2], 'months': months}
+    )
+
+    assert response.status_code == 422
+
+
+def test_correlation_default_window(client):
+    """Test that the default 36 month window still produces a full matrix"""
+    response = client.post('/api/risk/correlation-matrix', json={'fund_ids': [1, 2]})
+
+    assert response.status_code == 200
+    assert response.json()['correlation_matrix']['Fund 1']['Fund 1'] == 1.0
+
+
+def test_risk_extremes_keep_stored_precision(client):
+    """Test that best and worst months serialize as the stored float32 values"""
+    returns = DataStore().get_returns_by_fund_id(1)['monthly_return'].to_numpy()
+
+    risk_metrics = client.get('/api/risk/1').json()['risk_metrics']
+
+    assert risk_metrics['best_month'] == float(str(returns.max()))
+    assert risk_metrics['worst_month'] == float(str(returns.min()))
+
+
+def test_correlation_zero_months_uses_all_months(client):
+    """Test that a zero lookback means no window, the same as null"""
+    def correlation(**body):
+        response = client.post('/api/risk/correlation-matrix', json={'fund_ids': [1, 2], **body})
+        assert response.status_code == 200
+        return response.json()['correlation_matrix']
+
+    assert correlation(months=0) == correlation(months=None)
+    assert correlation(months=0) != correlation()
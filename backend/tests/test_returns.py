@@ -0,0 +1,49 @@
+import pytest
+
+
+def _transpose(records: list) -> dict:
+    """Records payload as the parallel arrays of the columnar format"""
+    return {key: [record[key] for record in records] for key in records[0]}
+
+
+@pytest.mark.parametrize('path, key', [
+    ('/api/returns/1?start_date=2021-01-31', 'returns'),
+    ('/api/risk/1/drawdown', 'drawdown_series'),
+])
+def test_columnar_series_matches_records(client, path, key):
+    """Test that format=columnar holds the records payload as parallel arrays"""
+    separator = '&' if '?' in path else '?'
+    records = client.get(path).json()
+    columnar = client.get(f'{path}{separator}format=columnar').json()
+
+    assert columnar[key] == _transpose(records[key])
+    assert {k: v for k, v in columnar.items() if k != key} == {
+        k: v for k, v in records.items() if k != key
+    }
+
+
+def test_columnar_multiple_returns_matches_records(client):
+    """Test the columnar layout of each fund in a multi-fund returns request"""
+    body = {'fund_ids': [1, 2], 'start_date': '2022-01-31'}
+    records = client.post('/api/returns/multiple', json=body).json()
+    columnar = client.post('/api/returns/multiple?format=columnar', json=body).json()
+
+    records_funds = records['funds']
+    columnar_funds = columnar['funds']
+    assert len(columnar_funds) == len(records_funds) == 2
+    for columnar_fund, records_fund in zip(columnar_funds, records_funds):
+        assert columnar_fund['returns'] == _transpose(records_fund['returns'])
+
+
+def test_columnar_correlation_matches_records(client):
+    """Test that the columnar correlation matrix is the nested dict as rows"""
+    body = {'fund_ids': [1, 2, 3]}
+    records = client.post('/api/risk/correlation-matrix', json=body).json()
+    columnar = client.post('/api/risk/correlation-matrix?format=columnar', json=body).json()
+
+    fund_names = records['fund_names']
+    assert columnar['fund_names'] == fund_names
+    assert columnar['correlation_matrix'] == [
+        [records['correlation_matrix'][row][column] for column in fund_names]
+        for row in fund_names
+    ]
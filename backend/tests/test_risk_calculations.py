@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from app.utils.risk_calculations import RiskCalculator
+
+
+def _returns_df(returns: list) -> pd.DataFrame:
+    """Monthly returns from January 2020 as the store holds them"""
+    return pd.DataFrame({
+        'date': pd.date_range('2020-01-31', periods=len(returns), freq='ME'),
+        'monthly_return': np.array(returns, dtype=np.float32)
+    })
+
+
+def test_max_drawdown_never_recovered():
+    """Test a drawdown that lasts to the end of the series"""
+    result = RiskCalculator.calculate_max_drawdown(_returns_df([2.0, -5.0, 1.0, -3.0]))
+
+    np.testing.assert_allclose(result['max_drawdown'], (0.95 * 1.01 * 0.97 - 1) * 100, rtol=1e-6)
+    assert result['peak_date'] == '2020-01-31'
+    assert result['trough_date'] == '2020-04-30'
+    assert result['recovery_date'] is None
+    assert result['duration_months'] == 3
+
+
+def test_max_drawdown_recovered():
+    """Test that recovery is the first month back at the running high"""
+    result = RiskCalculator.calculate_max_drawdown(_returns_df([1.0, 2.0, -4.0, 3.0, 2.0, 1.0]))
+
+    assert result['peak_date'] == '2020-02-29'
+    assert result['trough_date'] == '2020-03-31'
+    assert result['recovery_date'] == '2020-05-31'
+    assert result['duration_months'] == 1
+
+
+def test_max_drawdown_without_losses_recovers_on_trough():
+    """Test that a series that never falls has its trough, peak and recovery at the start"""
+    result = RiskCalculator.calculate_max_drawdown(_returns_df([1.0, 0.0, 2.5]))
+
+    assert result['max_drawdown'] == 0.0
+    assert result['peak_date'] == '2020-01-31'
+    assert result['trough_date'] == '2020-01-31'
+    assert result['recovery_date'] == '2020-01-31'
+    assert result['duration_months'] == 0
+
+
+def test_max_drawdown_peak_defaults_to_first_month(monkeypatch):
+    """Test a series already in drawdown at its first month, with no earlier peak"""
+    returns_df = _returns_df([-3.0, 1.0, 2.0])
+    drawdown_df = pd.DataFrame({'date': returns_df['date'], 'drawdown': [-3.0, -2.0, 0.0]})
+    monkeypatch.setattr(
+        RiskCalculator, 'calculate_drawdown_series', staticmethod(lambda df: drawdown_df)
+    )
+
+    result = RiskCalculator.calculate_max_drawdown(returns_df)
+
+    assert result['max_drawdown'] == -3.0
+    assert result['peak_date'] == '2020-01-31'
+    assert result['trough_date'] == '2020-01-31'
+    assert result['recovery_date'] == '2020-03-31'
+    assert result['duration_months'] == 0
@@ -0,0 +1,41 @@
+from app.storage import DataStore
+
+
+def test_returns_date_bounds_are_inclusive(client):
+    """Test that bounds on exact month ends keep those months"""
+    returns_df = DataStore().get_returns_by_fund_id(1, '2021-01-31', '2021-06-30')
+
+    assert returns_df['date_str'].tolist() == [
+        '2021-01-31', '2021-02-28', '2021-03-31', '2021-04-30', '2021-05-31', '2021-06-30'
+    ]
+    assert (returns_df['fund_id'] == 1).all()
+
+
+def test_returns_start_after_end_is_empty(client):
+    """Test that a start after the end selects no rows, with an empty log growth range"""
+    data_store = DataStore()
+
+    assert len(data_store.get_returns_by_fund_id(1, '2022-06-30', '2021-06-30')) == 0
+    assert len(data_store.get_log_growth_by_fund_id(1, '2022-06-30', '2021-06-30')) == 1
+
+
+def test_returns_unknown_fund(client):
+    """Test that an unknown fund has no returns but keeps the returns columns"""
+    data_store = DataStore()
+    returns_df = data_store.get_returns_by_fund_id(999)
+
+    assert len(returns_df) == 0
+    assert {'fund_id', 'date', 'monthly_return'} <= set(returns_df.columns)
+    assert data_store.get_log_growth_by_fund_id(999) is None
+
+
+def test_returns_timezone_suffixed_bound(client):
+    """Test that a timezone-suffixed bound is compared as UTC rather than raising"""
+    data_store = DataStore()
+
+    returns_df = data_store.get_returns_by_fund_id(1, '2021-01-31T00:00:00Z', '2021-03-31T00:00:00Z')
+    assert returns_df['date_str'].tolist() == ['2021-01-31', '2021-02-28', '2021-03-31']
+
+    # Midnight at UTC+2 is 22:00 UTC the day before, so it excludes that month end
+    returns_df = data_store.get_returns_by_fund_id(1, None, '2021-03-31T00:00:00+02:00')
+    assert returns_df['date_str'].iat[-1] == '2021-02-28'